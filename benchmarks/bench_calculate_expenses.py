@@ -0,0 +1,72 @@
+"""
+Бенчмарк calculate_expenses: однопроходный расчет на Python против группировки pandas
+(с построением DataFrame из списка словарей и по готовому DataFrame).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_calculate_expenses --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from src.views import calculate_expenses, calculate_expenses_vectorized
+
+CATEGORIES = [
+    "Супермаркеты",
+    "Фастфуд",
+    "Топливо",
+    "Развлечения",
+    "Транспорт",
+    "Аптеки",
+    "Связь",
+    "Одежда",
+    "Дом и ремонт",
+    "Переводы",
+    "Кафе",
+    "Такси",
+]
+
+
+def make_transactions(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "date": "2020-05-01",
+            "amount": round(rng.uniform(-5000, 3000), 2),
+            "category": rng.choice(CATEGORIES),
+        }
+        for _ in range(count)
+    ]
+
+
+def measure(func, transactions, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(transactions)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'транзакций':>12} {'python, мс':>12} {'pandas из списка, мс':>22} {'pandas DataFrame, мс':>22}")
+    for size in args.sizes:
+        transactions = make_transactions(size)
+        df = pd.DataFrame(transactions)
+        python_ms = measure(calculate_expenses, transactions, args.repeat)
+        from_list_ms = measure(calculate_expenses_vectorized, transactions, args.repeat)
+        dataframe_ms = measure(calculate_expenses, df, args.repeat)
+        print(f"{size:>12} {python_ms:>12.1f} {from_list_ms:>22.1f} {dataframe_ms:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Бенчмарк функций обработки транзакций на синтетических данных (benchmarks.synthetic_data):
+время и пиковая память.
+
+Для каждого размера (по умолчанию 10 000, 100 000 и 1 000 000 транзакций) измеряются
+загрузчики JSON/CSV/XLSX, фильтры, сортировка, генераторы, категоризация, расчет расходов
+и функции маскирования. Время — медиана нескольких запусков (perf_counter), память — пик
+выделений за один запуск по tracemalloc.
+
+Результаты можно сохранить как базовые (--save) и сравнить с ними (--compare): если время
+или память выросли больше чем на --threshold (по умолчанию 20%), скрипт завершается с кодом 1.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_processing --sizes 10000 100000 --save benchmarks/baseline.json
+    python -m benchmarks.bench_processing --sizes 10000 100000 --compare benchmarks/baseline.json
+"""
+
+import argparse
+import collections
+import contextlib
+import functools
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic_data import DESCRIPTIONS, account_number, card_number, iter_operations, write_dataset
+from src.categorize_transactions import categorize_transactions
+from src.filter_transactions import filter_by_transactions
+from src.generators import filter_by_currency, group_by_currency, transaction_descriptions
+from src.masks import get_mask_account, get_mask_card_number
+from src.processing import filter_by_state, sort_by_date
+from src.transactions_csv import get_financial_transactions
+from src.transactions_xlsx import get_financial_transactions_operations
+from src.utils import load_transactions
+from src.views import calculate_expenses
+from src.widget import mask_account_card
+
+CATEGORIES = ["Супермаркеты", "Фастфуд", "Топливо", "Развлечения", "Транспорт", "Аптеки", "Связь", "Переводы"]
+SEARCH_CATEGORIES = [description for description, _, _ in DESCRIPTIONS]
+
+# Чтение XLSX через pandas занимает секунды уже на 10 000 строк, поэтому размер для медленных функций ограничен
+SLOW_MAX_ROWS = 10_000
+
+
+def make_expenses(count: int, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {"date": "2020-05-01", "amount": round(rng.uniform(-5000, 3000), 2), "category": rng.choice(CATEGORIES)}
+        for _ in range(count)
+    ]
+
+
+class Dataset:
+    """Синтетические данные одного размера; файлы создаются во временном каталоге по первому запросу."""
+
+    def __init__(self, size: int, directory: str, seed: int = 42):
+        self.size = size
+        self.directory = directory
+        self.seed = seed
+        self.transactions = list(iter_operations(size, seed))
+        self._files: Dict[str, str] = {}
+
+    @functools.cached_property
+    def card_numbers(self) -> List[int]:
+        rng = random.Random(self.seed)
+        return [int(card_number(rng)) for _ in range(self.size)]
+
+    @functools.cached_property
+    def account_numbers(self) -> List[int]:
+        rng = random.Random(self.seed)
+        return [int(account_number(rng)) for _ in range(self.size)]
+
+    @functools.cached_property
+    def expenses(self) -> List[Dict]:
+        return make_expenses(self.size, self.seed)
+
+    def file(self, kind: str) -> str:
+        if kind not in self._files:
+            path = os.path.join(self.directory, f"transactions_{self.size}.{kind}")
+            write_dataset(path, self.size, self.seed)
+            self._files[kind] = path
+        return self._files[kind]
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[Dataset], object]
+    slow: bool = False  # Размер ограничен параметром --slow-max-rows
+
+
+def _drain(iterator) -> None:
+    collections.deque(iterator, maxlen=0)
+
+
+CASES = [
+    Case("load_transactions", lambda d: load_transactions(d.file("json"))),
+    Case("get_financial_transactions", lambda d: get_financial_transactions(d.file("csv"))),
+    Case(
+        "get_financial_transactions_operations",
+        lambda d: get_financial_transactions_operations(d.file("xlsx")),
+        slow=True,
+    ),
+    Case("filter_by_state", lambda d: filter_by_state(d.transactions)),
+    Case("sort_by_date", lambda d: sort_by_date(d.transactions)),
+    Case("filter_by_currency", lambda d: _drain(filter_by_currency(d.transactions, "USD"))),
+    Case("group_by_currency", lambda d: group_by_currency(d.transactions)),
+    Case("transaction_descriptions", lambda d: _drain(transaction_descriptions(d.transactions))),
+    Case("filter_by_transactions", lambda d: filter_by_transactions(d.transactions, "перевод")),
+    Case("categorize_transactions", lambda d: categorize_transactions(d.transactions, SEARCH_CATEGORIES)),
+    Case("calculate_expenses", lambda d: calculate_expenses(d.expenses)),
+    Case("get_mask_card_number", lambda d: [get_mask_card_number(number) for number in d.card_numbers]),
+    Case("get_mask_account", lambda d: [get_mask_account(number) for number in d.account_numbers]),
+    Case("mask_account_card", lambda d: [mask_account_card(t["from"]) for t in d.transactions if "from" in t]),
+]
+
+
+@contextlib.contextmanager
+def _quiet():
+    # Загрузчики печатают каждую строку и пишут данные в журнал; на миллионах строк это гигабайты вывода
+    logging.disable(logging.CRITICAL)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def measure(case: Case, dataset: Dataset, repeat: int) -> Dict[str, float]:
+    """Возвращает медиану времени в секундах и пик памяти в байтах."""
+    case.run(dataset)  # Прогрев: создание файлов и кэшей не входит в измерение
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        case.run(dataset)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        case.run(dataset)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": statistics.median(timings), "peak_bytes": peak}
+
+
+def run(
+    sizes: List[int], repeat: int, selected: Optional[List[str]] = None, slow_max_rows: int = SLOW_MAX_ROWS
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            dataset = Dataset(size, directory)
+            for case in CASES:
+                if selected and case.name not in selected:
+                    continue
+                if case.slow and size > slow_max_rows:
+                    continue
+                with _quiet():
+                    result = measure(case, dataset, repeat)
+                key = f"{case.name}[{size}]"
+                results[key] = result
+                print(f"{key:<50} {result['seconds'] * 1000:>12.1f} мс {result['peak_bytes'] / 2**20:>10.1f} МБ")
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Возвращает описания регрессий: рост времени или памяти больше чем на threshold."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if base[metric] and result[metric] > base[metric] * (1 + threshold):
+                change = result[metric] / base[metric] - 1
+                regressions.append(f"{key} {metric}: {base[metric]:.6g} -> {result[metric]:.6g} (+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Имена измеряемых функций")
+    parser.add_argument(
+        "--slow-max-rows", type=int, default=SLOW_MAX_ROWS, help="Максимальный размер для медленных функций (XLSX)"
+    )
+    parser.add_argument("--save", help="Сохранить результаты как базовые в JSON-файл")
+    parser.add_argument("--compare", help="Сравнить с базовыми результатами из JSON-файла")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Допустимый рост времени и памяти")
+    args = parser.parse_args()
+
+    print(f"{'функция[транзакций]':<50} {'время':>15} {'пик памяти':>13}")
+    results = run(args.sizes, args.repeat, args.only, args.slow_max_rows)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print("\nРегрессии:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print("\nРегрессий нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Бенчмарк get_stock_data: полный разбор ответа TIME_SERIES_DAILY против потокового.
+
+Локальная заглушка API (benchmarks.mock_upstream) отдает большой ответ (по умолчанию 20 лет дневных котировок),
+имитируя outputsize=full. Измеряются время запроса и пиковая память на стороне клиента.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_stock_stream --days 5000 --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.mock_upstream import UpstreamConfig, start_server
+
+
+def measure(func, repeat: int) -> dict:
+    """Возвращает медиану времени вызова и пиковую память за один вызов."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(timings) * 1000, "peak_kib": peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=7300, help="Количество дней во временном ряду")
+    parser.add_argument("--repeat", type=int, default=10, help="Количество повторов каждого замера")
+    args = parser.parse_args()
+
+    config = UpstreamConfig(days=args.days)
+    payload = config.time_series("AAPL")
+    server = start_server(config)
+    os.environ["STOCK_API_URL"] = f"http://127.0.0.1:{server.server_port}/"
+    os.environ["STOCK_API_KEY"] = "benchmark"
+
+    from src.views import get_stock_data
+
+    print(f"Размер ответа: {len(payload) / 1024 / 1024:.1f} MiB, дней: {args.days}")
+    for name, kwargs in (("json()", {"stream": False}), ("stream", {"stream": True})):
+        result = measure(lambda: get_stock_data("AAPL", **kwargs), args.repeat)
+        print(f"{name:>8}: медиана {result['median_ms']:.2f} мс, пик памяти {result['peak_kib']:.0f} KiB")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Нагрузочный тест Flask API из src.app.
+
+Отправляет запросы к `/`, `/currency`, `/stock/<symbol>` и `/api/data` с заданной частотой
+(открытая модель: запросы отправляются по расписанию, не дожидаясь предыдущих) и выводит
+пропускную способность и перцентили задержки по каждому маршруту.
+
+С флагом --in-process запускает в фоновых потоках заглушку внешних API
+(benchmarks.mock_upstream) и само приложение, так что тест не требует сети.
+
+Запуск из корня проекта:
+    python -m benchmarks.load_test --in-process --rps 50 --duration 10 --upstream-latency 0.05
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --rps 100 --duration 30
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.mock_upstream import UpstreamConfig, start_server
+
+DEFAULT_PATHS = [
+    "/",
+    "/currency",
+    "/stock/AAPL",
+    "/api/data?date_time=2024-10-28 12:00:00",
+]
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Возвращает перцентиль отсортированного списка методом ближайшего ранга."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def start_app_in_process(upstream_config: UpstreamConfig) -> str:
+    """Запускает заглушку внешних API и приложение в фоновых потоках, возвращает URL приложения."""
+    from werkzeug.serving import make_server
+
+    upstream = start_server(upstream_config)
+    upstream_url = f"http://127.0.0.1:{upstream.server_port}"
+    os.environ["CURRENCY_API_URL"] = upstream_url
+    os.environ["CURRENCY_API_KEY"] = "load-test"
+    os.environ["STOCK_API_URL"] = upstream_url + "/"
+    os.environ["STOCK_API_KEY"] = "load-test"
+
+    from src.app import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="app-under-test", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def run_load(base_url: str, paths: list, rps: float, duration: float, concurrency: int) -> dict:
+    """Отправляет запросы по кругу по списку маршрутов с частотой rps в течение duration секунд.
+
+    Возвращает словарь: маршрут -> {"latencies": [...], "errors": int}. Задержка отсчитывается
+    от запланированного времени отправки, а не от фактического: если пул занят и запрос ждет
+    свободного потока, ожидание входит в задержку (без этого перегрузка скрывается — coordinated omission).
+    """
+    results = defaultdict(lambda: {"latencies": [], "errors": 0})
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(path: str, scheduled: float) -> None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        try:
+            response = session.get(base_url + path, timeout=30)
+            failed = response.status_code >= 500
+        except requests.RequestException:
+            failed = True
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            results[path]["latencies"].append(elapsed)
+            if failed:
+                results[path]["errors"] += 1
+
+    interval = 1.0 / rps
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for number, path in enumerate(itertools.cycle(paths)):
+            scheduled = started + number * interval
+            if scheduled - started >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, path, scheduled)
+    return dict(results)
+
+
+def print_report(results: dict, elapsed: float) -> None:
+    total = sum(len(stats["latencies"]) for stats in results.values())
+    print(f"Всего запросов: {total} за {elapsed:.1f} с, пропускная способность {total / elapsed:.1f} запр./с")
+    print(f"{'маршрут':<45} {'запр.':>6} {'ошиб.':>6} {'p50, мс':>9} {'p90, мс':>9} {'p99, мс':>9} {'max, мс':>9}")
+    for path, stats in results.items():
+        latencies = sorted(stats["latencies"])
+        print(
+            f"{path:<45} {len(latencies):>6} {stats['errors']:>6} "
+            f"{statistics.median(latencies) * 1000:>9.1f} {percentile(latencies, 0.9) * 1000:>9.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>9.1f} {latencies[-1] * 1000:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Адрес тестируемого приложения")
+    parser.add_argument("--in-process", action="store_true", help="Запустить приложение и заглушку API локально")
+    parser.add_argument("--rps", type=float, default=20, help="Целевое количество запросов в секунду")
+    parser.add_argument("--duration", type=float, default=10, help="Длительность теста, в секундах")
+    parser.add_argument("--concurrency", type=int, default=64, help="Максимум одновременных запросов")
+    parser.add_argument("--path", action="append", dest="paths", help="Маршрут для нагрузки (можно повторять)")
+    parser.add_argument("--upstream-latency", type=float, default=0.0, help="Задержка заглушки API, в секундах")
+    parser.add_argument("--upstream-jitter", type=float, default=0.0, help="Разброс задержки заглушки, в секундах")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="Доля ошибок заглушки, от 0 до 1")
+    args = parser.parse_args()
+
+    base_url = args.url
+    if args.in_process:
+        config = UpstreamConfig(args.upstream_latency, args.upstream_jitter, args.upstream_error_rate)
+        base_url = start_app_in_process(config)
+
+    started = time.perf_counter()
+    results = run_load(base_url, args.paths or DEFAULT_PATHS, args.rps, args.duration, args.concurrency)
+    print_report(results, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
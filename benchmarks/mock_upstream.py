@@ -0,0 +1,138 @@
+"""
+Локальная заглушка внешних API курсов валют и котировок акций.
+
+Эмулирует эндпоинты `/latest` (курсы валют) и `/query?function=TIME_SERIES_DAILY` (котировки)
+с настраиваемой задержкой и долей ошибок, чтобы измерять `src.app` без реальных API.
+
+Запуск из корня проекта:
+    python -m benchmarks.mock_upstream --port 8081 --latency 0.05 --error-rate 0.01
+
+После запуска укажите в окружении приложения:
+    CURRENCY_API_URL=http://127.0.0.1:8081
+    STOCK_API_URL=http://127.0.0.1:8081/
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+RATES = {"USD": 1.077348, "EUR": 1.0, "GBP": 0.8312, "CNY": 7.6741, "RUB": 101.5423, "JPY": 161.2874}
+
+
+def build_time_series(symbol: str, days: int) -> bytes:
+    """Формирует ответ TIME_SERIES_DAILY с заданным количеством дней, от новых к старым."""
+    start = date(2024, 10, 28)
+    series = {}
+    for offset in range(days):
+        price = 100 + (offset % 50)
+        series[(start - timedelta(days=offset)).isoformat()] = {
+            "1. open": f"{price:.4f}",
+            "2. high": f"{price + 1:.4f}",
+            "3. low": f"{price - 1:.4f}",
+            "4. close": f"{price + 0.5:.4f}",
+            "5. volume": str(1_000_000 + offset),
+        }
+    payload = {
+        "Meta Data": {"1. Information": "Daily Prices", "2. Symbol": symbol, "4. Output Size": "Full size"},
+        "Time Series (Daily)": series,
+    }
+    return json.dumps(payload, indent=4).encode("utf-8")
+
+
+class UpstreamConfig:
+    """Параметры поведения заглушки."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, days: int = 100):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.days = days
+        self._series_cache: dict = {}
+        self._lock = threading.Lock()
+
+    def time_series(self, symbol: str) -> bytes:
+        with self._lock:
+            if symbol not in self._series_cache:
+                self._series_cache[symbol] = build_time_series(symbol, self.days)
+            return self._series_cache[symbol]
+
+
+class UpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Разрыв соединения клиентом — штатная ситуация для потокового разбора и нагрузочного теста
+        pass
+
+
+def make_handler(config: UpstreamConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Клиент закрыл соединение, не дочитав ответ (потоковый разбор)
+
+        def do_GET(self):
+            if config.latency or config.jitter:
+                time.sleep(max(0.0, random.gauss(config.latency, config.jitter)))
+            if config.error_rate and random.random() < config.error_rate:
+                self._send(503, b'{"error": "Service Unavailable"}')
+                return
+
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path.rstrip("/").endswith("/latest"):
+                body = json.dumps({"success": True, "base": "EUR", "rates": RATES}).encode("utf-8")
+                self._send(200, body)
+            elif url.path.rstrip("/").endswith("query") and query.get("function") == ["TIME_SERIES_DAILY"]:
+                symbol = query.get("symbol", [""])[0]
+                self._send(200, config.time_series(symbol))
+            else:
+                self._send(404, b'{"error": "Not Found"}')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(config: UpstreamConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Запускает заглушку в фоновом потоке и возвращает сервер (порт — server.server_port)."""
+    server = UpstreamServer((host, port), make_handler(config))
+    threading.Thread(target=server.serve_forever, name="mock-upstream", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="Средняя задержка ответа, в секундах")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Стандартное отклонение задержки, в секундах")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов с кодом 503, от 0 до 1")
+    parser.add_argument("--days", type=int, default=100, help="Количество дней во временном ряду котировок")
+    args = parser.parse_args()
+
+    config = UpstreamConfig(args.latency, args.jitter, args.error_rate, args.days)
+    server = UpstreamServer((args.host, args.port), make_handler(config))
+    print(f"Заглушка API запущена на http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Генератор синтетических банковских операций в форматах, которые читают загрузчики проекта:
+JSON (src.utils.load_transactions), CSV с разделителем ";" (src.transactions_csv) и XLSX
+(src.transactions_xlsx).
+
+Операции генерируются потоково и сразу записываются в файл, поэтому миллионы строк не
+хранятся в памяти. При одинаковом seed данные совпадают во всех форматах. Номера карт —
+16 цифр с верной контрольной суммой Луна, номера счетов — 20 цифр.
+
+Запуск из корня проекта:
+    python -m benchmarks.synthetic_data data/transactions_1m.json --count 1000000 --seed 42
+    python -m benchmarks.synthetic_data data/transactions_1m.csv --count 1000000
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+import openpyxl
+
+from src.generators import luhn_check_digit
+
+# Распределения близки к примерам из src/data
+STATES = ["EXECUTED", "CANCELED", "PENDING"]
+STATE_WEIGHTS = [70, 16, 14]
+CURRENCIES = [("руб.", "RUB"), ("USD", "USD"), ("EUR", "EUR"), ("Yuan Renminbi", "CNY"), ("Rupiah", "IDR")]
+CURRENCY_WEIGHTS = [50, 30, 10, 6, 4]
+# Описание операции, отправитель и получатель: "card", "account", "any" или None (отправителя нет)
+DESCRIPTIONS = [
+    ("Перевод организации", "any", "account"),
+    ("Перевод с карты на карту", "card", "card"),
+    ("Перевод с карты на счет", "card", "account"),
+    ("Перевод со счета на счет", "account", "account"),
+    ("Открытие вклада", None, "account"),
+]
+DESCRIPTION_WEIGHTS = [40, 19, 16, 15, 10]
+CARD_TYPES = ["Maestro", "MasterCard", "Visa Classic", "Visa Gold", "Visa Platinum", "МИР"]
+FLAT_FIELDS = ["id", "state", "date", "amount", "currency_name", "currency_code", "from", "to", "description"]
+
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+PERIOD_START = datetime(2018, 1, 1)
+PERIOD_SECONDS = int((datetime(2025, 1, 1) - PERIOD_START).total_seconds())
+
+
+def card_number(rng: random.Random) -> str:
+    """16-значный номер карты с верной контрольной суммой Луна."""
+    body = rng.randrange(10**14, 10**15)
+    return f"{body}{luhn_check_digit(body)}"
+
+
+def account_number(rng: random.Random) -> str:
+    """20-значный номер счета."""
+    return str(rng.randrange(10**19, 10**20))
+
+
+def _cumulative(weights):
+    total, result = 0, []
+    for weight in weights:
+        total += weight
+        result.append(total)
+    return result
+
+
+_STATE_CUMULATIVE = _cumulative(STATE_WEIGHTS)
+_CURRENCY_CUMULATIVE = _cumulative(CURRENCY_WEIGHTS)
+_DESCRIPTION_CUMULATIVE = _cumulative(DESCRIPTION_WEIGHTS)
+
+
+def _pick(rng: random.Random, items, cumulative):
+    return items[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+
+
+def _party(kind, rng: random.Random):
+    if kind is None:
+        return None
+    if kind == "any":
+        kind = "card" if rng.random() < 0.6 else "account"
+    if kind == "card":
+        return f"{rng.choice(CARD_TYPES)} {card_number(rng)}"
+    return f"Счет {account_number(rng)}"
+
+
+def iter_operations(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Выдает count операций во вложенном формате JSON (operationAmount.currency) по одной."""
+    rng = random.Random(seed)
+    next_id = 100_000_000
+    for _ in range(count):
+        next_id += rng.randint(1, 50)  # Идентификаторы уникальны и возрастают
+        currency_name, currency_code = _pick(rng, CURRENCIES, _CURRENCY_CUMULATIVE)
+        description, source, target = _pick(rng, DESCRIPTIONS, _DESCRIPTION_CUMULATIVE)
+        date = PERIOD_START + timedelta(seconds=rng.randrange(PERIOD_SECONDS), microseconds=rng.randrange(10**6))
+        operation = {
+            "id": next_id,
+            "state": _pick(rng, STATES, _STATE_CUMULATIVE),
+            "date": date.isoformat(timespec="microseconds"),
+            "operationAmount": {
+                "amount": f"{min(rng.lognormvariate(9, 1.2), 999_999):.2f}",
+                "currency": {"name": currency_name, "code": currency_code},
+            },
+            "description": description,
+        }
+        sender = _party(source, rng)
+        if sender is not None:
+            operation["from"] = sender
+        operation["to"] = _party(target, rng)
+        yield operation
+
+
+def to_flat(operation: Dict) -> Dict:
+    """Операция в плоском формате CSV/XLSX."""
+    amount = operation["operationAmount"]
+    return {
+        "id": operation["id"],
+        "state": operation["state"],
+        "date": operation["date"][:19] + "Z",
+        "amount": float(amount["amount"]),
+        "currency_name": amount["currency"]["name"],
+        "currency_code": amount["currency"]["code"],
+        "from": operation.get("from", ""),
+        "to": operation["to"],
+        "description": operation["description"],
+    }
+
+
+def write_json(path: str, count: int, seed: int = 42) -> None:
+    """Записывает JSON-массив операций, сериализуя их по одной."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for index, operation in enumerate(iter_operations(count, seed)):
+            file.write(",\n" if index else "\n")
+            file.write(_encode(operation))
+        file.write("\n]\n")
+
+
+def write_csv(path: str, count: int, seed: int = 42) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=FLAT_FIELDS, delimiter=";")
+        writer.writeheader()
+        for operation in iter_operations(count, seed):
+            writer.writerow(to_flat(operation))
+
+
+def write_xlsx(path: str, count: int, seed: int = 42) -> None:
+    """Записывает лист XLSX в потоковом режиме openpyxl (write_only)."""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(FLAT_FIELDS)
+    for operation in iter_operations(count, seed):
+        row = to_flat(operation)
+        sheet.append([row[field] for field in FLAT_FIELDS])
+    workbook.save(path)
+
+
+WRITERS: Dict[str, Callable[[str, int, int], None]] = {"json": write_json, "csv": write_csv, "xlsx": write_xlsx}
+
+
+def write_dataset(path: str, count: int, seed: int = 42, file_format: Optional[str] = None) -> None:
+    """Записывает count операций в файл; формат определяется по расширению, если не задан."""
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format not in WRITERS:
+        raise ValueError(f"Неподдерживаемый формат: {file_format}. Доступны: {', '.join(WRITERS)}")
+    WRITERS[file_format](path, count, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Путь к создаваемому файлу (.json, .csv или .xlsx)")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=sorted(WRITERS), help="Формат файла, если не совпадает с расширением")
+    args = parser.parse_args()
+    write_dataset(args.path, args.count, args.seed, args.format)
+
+
+if __name__ == "__main__":
+    main()
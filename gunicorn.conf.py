@@ -0,0 +1,32 @@
+"""
+Конфигурация gunicorn для src.wsgi:app.
+
+Каждый воркер — отдельный процесс со своим пулом потоков для обращений к внешним API
+(src.executor.WorkerExecutor). Количество процессов и потоков задается переменными окружения.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+
+def post_fork(server, worker):
+    # Потоки родительского процесса не переживают fork: перезапускаем фоновое обновление курсов в воркере
+    from src.app import rates_refresher
+
+    if rates_refresher is not None:
+        rates_refresher.start()
+
+
+def worker_exit(server, worker):
+    # Дожидаемся выполняющихся обращений к внешним API и освобождаем потоки пула
+    from src.app import executor
+
+    executor.shutdown(wait=True)
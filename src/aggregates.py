@@ -0,0 +1,81 @@
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class CardAggregates:
+    """
+    Хранилище агрегатов по картам (ключ — последние 4 цифры номера).
+
+    Для каждой карты поддерживаются нарастающие итоги (сумма расходов, кэшбэк, количество операций)
+    и дневные корзины для запросов за период. Итоги обновляются инкрементально при добавлении
+    операций, поэтому сводка по картам не пересчитывается по всей истории.
+
+    Операция — словарь с ключами "card_number", "amount" (расход — отрицательная сумма),
+    "date" (YYYY-MM-DD, может отсутствовать) и "status" (учитываются только "OK").
+    """
+
+    def __init__(self, operations: Iterable[Dict] = ()):
+        self._totals: Dict[str, List[float]] = {}  # последние 4 цифры -> [сумма расходов, количество операций]
+        self._daily: Dict[str, Dict[str, List[float]]] = {}  # последние 4 цифры -> дата -> [сумма, количество]
+        self._days: Dict[str, List[str]] = {}  # последние 4 цифры -> отсортированные даты корзин
+        self._lock = threading.Lock()
+        self.add_many(operations)
+
+    def add(self, operation: Dict) -> None:
+        """Учитывает одну операцию. Пополнения, неуспешные операции и операции без карты пропускаются."""
+        card_number = operation.get("card_number")
+        if operation.get("status", "OK") != "OK" or operation["amount"] >= 0 or not card_number:
+            return
+        last4 = str(card_number)[-4:]
+        spent = -operation["amount"]
+        date = operation.get("date")
+
+        with self._lock:
+            totals = self._totals.setdefault(last4, [0.0, 0])
+            totals[0] += spent
+            totals[1] += 1
+            if date:
+                daily = self._daily.setdefault(last4, {})
+                if date not in daily:
+                    daily[date] = [0.0, 0]
+                    bisect.insort(self._days.setdefault(last4, []), date)
+                daily[date][0] += spent
+                daily[date][1] += 1
+
+    def add_many(self, operations: Iterable[Dict]) -> None:
+        for operation in operations:
+            self.add(operation)
+
+    def card(self, last4: str, start: Optional[str] = None, end: Optional[str] = None) -> Dict:
+        """
+        Возвращает сводку по карте: сумму расходов, кэшбэк (1 рубль на каждые 100 рублей) и количество операций.
+
+        :param last4: Последние 4 цифры номера карты.
+        :param start: Начальная дата периода включительно (YYYY-MM-DD). Без start и end — за всё время.
+        :param end: Конечная дата периода включительно (YYYY-MM-DD).
+        """
+        with self._lock:
+            if start is None and end is None:
+                total_spent, count = self._totals.get(last4, (0.0, 0))
+            else:
+                # Бинарный поиск границ периода среди дат корзин: O(log n + k)
+                days = self._days.get(last4, [])
+                low = bisect.bisect_left(days, start) if start else 0
+                high = bisect.bisect_right(days, end) if end else len(days)
+                daily = self._daily.get(last4, {})
+                total_spent = sum(daily[day][0] for day in days[low:high])
+                count = sum(daily[day][1] for day in days[low:high])
+
+        return {
+            "last_digits": last4,
+            "total_spent": round(total_spent, 2),
+            "cashback": round(total_spent / 100, 2),
+            "count": count,
+        }
+
+    def summary(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Возвращает сводку по всем картам за период (без start и end — за всё время)."""
+        with self._lock:
+            cards = list(self._totals)
+        return [self.card(last4, start, end) for last4 in cards]
@@ -1,18 +1,59 @@
 import concurrent.futures
+import heapq
+import itertools
 import logging
+import os
 from datetime import datetime
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 
-from src.views import get_currency_data, get_stock_data
+from src.aggregates import CardAggregates
+from src.cache import PeriodicRefresher
+from src.compression import init_compression
+from src.executor import ExecutorBusyError, WorkerExecutor, register_shutdown
+from src.http_cache import cached_response, response_cache, uncacheable
+from src.json_provider import init_json_provider
+from src.metrics import init_metrics
+from src.operations import OPERATIONS_PATH, TOP_TRANSACTIONS_COUNT, load_operations, top_transactions
+from src.transactions_query import SOURCES, decode_cursor, encode_cursor, parse_date, query_transactions
+from src.views import (
+    get_cached_currency_data,
+    get_cached_stock_data,
+    get_stale_currency_data,
+    get_stale_stock_data,
+    get_stock_data,
+    get_stocks_data,
+    refresh_currency_data,
+)
 
 load_dotenv()
 app = Flask(__name__)
+init_json_provider(app)  # Быстрая сериализация JSON (orjson), если библиотека установлена
+init_compression(app)  # Сжатие ответов gzip/brotli по Accept-Encoding
+init_metrics(app)  # Метрики запросов и этапов обработки на /metrics
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 
+# Пул потоков для обращений к внешним API, общий для всех запросов воркера
+executor = WorkerExecutor(
+    max_workers=int(os.getenv("APP_EXECUTOR_WORKERS", "16")),
+    max_queue=int(os.getenv("APP_EXECUTOR_QUEUE", "64")),
+)
+app.extensions["worker_executor"] = executor
+register_shutdown(executor)
+
+# Фоновое обновление кэша курсов валют, чтобы обработчики запросов не ходили во внешний API
+rates_refresher = None
+if os.getenv("RATES_REFRESH_INTERVAL"):
+    rates_refresher = PeriodicRefresher(
+        refresh_currency_data,
+        float(os.environ["RATES_REFRESH_INTERVAL"]),
+        on_error=lambda e: logging.error("Error refreshing currency data: %s", e),
+    )
+    rates_refresher.start()
+
 
 # Корневой маршрут
 @app.route("/", methods=["GET"])
@@ -21,17 +62,24 @@ def home():
 
 
 @app.route("/currency", methods=["GET"])
+@cached_response()
 def currency():
     try:
         logging.debug("Fetching currency data")
-        currency_data = get_currency_data()
+        currency_data = get_cached_currency_data()
         return jsonify(currency_data), 200
     except Exception as e:
         logging.error("Error fetching currency data: %s", e)
+        stale_data = get_stale_currency_data()
+        if stale_data is not None:
+            response = jsonify(stale_data)
+            response.headers["Warning"] = '110 - "Response is Stale"'
+            return uncacheable(response), 200  # Устаревшие курсы не кэшируем
         return jsonify({"error": f"Failed to fetch currency data: {str(e)}"}), 500
 
 
 @app.route("/stock/<symbol>", methods=["GET"])
+@cached_response()
 def get_stock(symbol):
     try:
         data = get_stock_data(symbol)
@@ -44,6 +92,77 @@ def get_stock(symbol):
         return jsonify({"error": "Internal server error"}), 500
 
 
+# Общий бюджет времени на обращения к внешним API в /api/data, в секундах
+API_DATA_DEADLINE = float(os.getenv("API_DATA_DEADLINE", "3"))
+
+# Ограничение на количество символов в одном пакетном запросе
+MAX_BATCH_SYMBOLS = 50
+
+
+@app.route("/stocks", methods=["GET"])
+@cached_response()
+def get_stocks():
+    symbols = [symbol for symbol in request.args.get("symbols", "").split(",") if symbol.strip()]
+    if not symbols:
+        return jsonify({"error": "Parameter 'symbols' is required"}), 400
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({"error": f"Too many symbols, maximum is {MAX_BATCH_SYMBOLS}"}), 400
+
+    results, errors = get_stocks_data(symbols, executor=executor)
+    response = jsonify({"stocks": results, "errors": errors})
+    return uncacheable(response) if errors else response
+
+
+# Размер страницы выдачи транзакций по умолчанию и максимальный
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+@app.route("/transactions", methods=["GET"])
+def get_transactions():
+    source = request.args.get("source", "json")
+    if source not in SOURCES:
+        return jsonify({"error": f"Unknown source, use one of: {', '.join(SOURCES)}"}), 400
+
+    try:
+        position = decode_cursor(request.args.get("cursor"), source)
+        limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        date_from = parse_date(request.args.get("date_from"))
+        date_to = parse_date(request.args.get("date_to"))
+        # Чтение продолжается с сохраненной в курсоре позиции, а не с начала источника
+        transactions = SOURCES[source](position)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid query parameters: {e}"}), 400
+
+    matches = query_transactions(
+        transactions,
+        state=request.args.get("state"),
+        currency=request.args.get("currency"),
+        description=request.args.get("description"),
+        date_from=date_from,
+        date_to=date_to,
+        positioned=True,
+    )
+
+    if request.args.get("format") == "ndjson":
+        # Потоковая выдача всех подходящих транзакций построчно, без сборки ответа в памяти
+        def generate():
+            for _, transaction in matches:
+                yield app.json.dumps(transaction) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    page = list(itertools.islice(matches, limit + 1))  # Лишний элемент показывает, есть ли следующая страница
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(source, page[-1][0])
+
+    return jsonify({"transactions": [transaction for _, transaction in page], "next_cursor": next_cursor})
+
+
 # Пример данных о картах
 cards = [{"number": "1234567812345814", "expenses": [1200, 62]}, {"number": "9876543210987512", "expenses": [7.94]}]
 
@@ -70,15 +189,66 @@ def get_greeting(current_time):
         return "Добрый вечер"
 
 
-def calculate_cashback(expenses):
-    return sum(expenses) / 100  # 1 рубль на каждые 100 рублей
+def _submit(func, *args):
+    """Ставит задачу в пул воркера. Если пул перегружен, возвращает future с ошибкой."""
+    try:
+        return executor.submit(func, *args)
+    except ExecutorBusyError as e:
+        future = concurrent.futures.Future()
+        future.set_exception(e)
+        return future
+
+
+def _future_result(future):
+    """Возвращает результат завершенной задачи или выбрасывает TimeoutError, если она не уложилась в срок."""
+    if not future.done():
+        raise TimeoutError("Превышено время ожидания ответа внешнего API")
+    return future.result()
 
 
 def get_top_transactions():
-    return sorted(transactions, key=lambda x: x["amount"], reverse=True)[:5]
+    # Тот же формат, что и у топа по выгрузке операций: сумма по модулю, округленная до копеек
+    return top_transactions(transactions)
+
+
+def get_sample_operations():
+    """Преобразует пример данных о картах в операции списания для хранилища агрегатов."""
+    return [{"card_number": card["number"], "amount": -expense} for card in cards for expense in card["expenses"]]
+
+
+def load_dashboard_data():
+    """Загружает операции один раз при старте, строит агрегаты по картам и топ транзакций.
+
+    Если выгрузку операций прочитать не удалось, используются примеры данных из этого модуля.
+    """
+    try:
+        operations = load_operations(OPERATIONS_PATH)
+    except Exception as e:
+        logging.error("Failed to load operations from %s, using sample data: %s", OPERATIONS_PATH, e)
+        return CardAggregates(get_sample_operations()), get_top_transactions()
+    logging.info("Loaded %d operations from %s", len(operations), OPERATIONS_PATH)
+    return CardAggregates(operations), top_transactions(operations)
+
+
+# Сводка для /api/data не зависит от запроса, поэтому хранится готовой и обновляется инкрементально
+card_aggregates, dashboard_top_transactions = load_dashboard_data()
+
+
+def ingest_operations(new_operations):
+    """Учитывает новые операции в агрегатах по картам и в топе транзакций без пересчета всей истории."""
+    global dashboard_top_transactions
+    new_operations = list(new_operations)
+    card_aggregates.add_many(new_operations)
+    dashboard_top_transactions = heapq.nlargest(
+        TOP_TRANSACTIONS_COUNT,
+        dashboard_top_transactions + top_transactions(new_operations),
+        key=lambda x: abs(x["amount"]),
+    )
+    response_cache.clear()  # Закэшированные ответы /api/data устарели
 
 
 @app.route("/api/data", methods=["GET"])
+@cached_response()
 def get_data():
     date_time_str = request.args.get("date_time")
     if not date_time_str:
@@ -91,43 +261,44 @@ def get_data():
 
     greeting = get_greeting(current_time)
 
-    # Получение информации по картам
-    card_info = []
-    for card in cards:
-        last4 = card["number"][-4:]  # последние 4 цифры карты
-        total_spent = sum(card["expenses"])  # Общая сумма расходов
-        cashback = calculate_cashback(card["expenses"])  # Кэшбэк
-        card_info.append({"last_digits": last4, "total_spent": round(total_spent, 2), "cashback": round(cashback, 2)})
+    stock_symbols = ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]
+    errors = {}
 
-    top_transactions = get_top_transactions()
+    # Внешние API опрашиваются параллельно, но ответ не ждет их дольше API_DATA_DEADLINE секунд
+    currency_future = _submit(get_cached_currency_data)  # Получение данных о курсах валют
+    future_to_symbol = {_submit(get_cached_stock_data, symbol): symbol for symbol in stock_symbols}
+    concurrent.futures.wait([currency_future, *future_to_symbol], timeout=API_DATA_DEADLINE)
+    for future in [currency_future, *future_to_symbol]:
+        future.cancel()  # Задачи, не начавшиеся до истечения срока, больше не нужны
 
     try:
-        currency_rates = get_currency_data()  # Получение данных о курсах валют
-        stock_symbols = ["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"]
-        stock_prices = []
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_to_symbol = {executor.submit(get_stock_data, symbol): symbol for symbol in stock_symbols}
-            for future in concurrent.futures.as_completed(future_to_symbol):
-                symbol = future_to_symbol[future]
-                try:
-                    stock_prices.append(future.result())
-                except Exception as e:
-                    logging.error(f"Error fetching stock price for {symbol}: {e}")
-                    stock_prices.append({"symbol": symbol, "error": str(e)})
+        currency_rates = _future_result(currency_future)
     except Exception as e:
-        logging.error("Error fetching stock data or currency rate: %s", e)
-        return jsonify({"error": "Failed to fetch stock price or currency rate: " + str(e)}), 500
-
-    return jsonify(
-        {
-            "greeting": greeting,
-            "cards": card_info,
-            "top_transactions": top_transactions,
-            "currency_rates": currency_rates,
-            "stock_prices": stock_prices,
-        }
-    )
+        logging.error("Error fetching currency rate: %s", e)
+        currency_rates = get_stale_currency_data() or []
+        errors["currency_rates"] = str(e)
+
+    stock_prices = []
+    for future, symbol in future_to_symbol.items():
+        try:
+            stock_prices.append(_future_result(future))
+        except Exception as e:
+            logging.error(f"Error fetching stock price for {symbol}: {e}")
+            errors.setdefault("stock_prices", {})[symbol] = str(e)
+            stale_data = get_stale_stock_data(symbol)
+            stock_prices.append(stale_data if stale_data is not None else {"symbol": symbol, "error": str(e)})
+
+    response_data = {
+        "greeting": greeting,
+        "cards": card_aggregates.summary(),
+        "top_transactions": dashboard_top_transactions,
+        "currency_rates": currency_rates,
+        "stock_prices": stock_prices,
+    }
+    if errors:
+        response_data["errors"] = errors
+        return uncacheable(jsonify(response_data))  # Неполные данные не кэшируем
+    return jsonify(response_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU-кэш в памяти процесса с ограничением по времени жизни записей.
+
+    :param maxsize: Максимальное количество записей. При переполнении вытесняется самая давно использованная.
+    :param ttl: Время жизни записи в секундах. None — записи не устаревают.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным числом")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None, allow_stale: bool = False) -> Any:
+        """Возвращает значение по ключу или default, если записи нет или она устарела.
+
+        С allow_stale=True возвращается и устаревшая, но ещё не вытесненная запись.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if not allow_stale and expires_at is not None and expires_at < time.monotonic():
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение. Параметр ttl переопределяет время жизни, заданное для кэша."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Кэш в файле SQLite, общий для нескольких процессов (например, воркеров gunicorn).
+
+    Значения сериализуются в JSON. Время жизни считается по системным часам,
+    так как монотонные часы у разных процессов не согласованы.
+
+    :param path: Путь к файлу базы данных.
+    :param ttl: Время жизни записи в секундах. None — записи не устаревают.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Соединения sqlite3 нельзя разделять между потоками, поэтому храним по одному на поток
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[tuple]:
+        """Возвращает пару (значение, оставшееся время жизни в секундах или None) либо None, если записи нет."""
+        row = self._connect().execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        remaining = expires_at - time.time() if expires_at is not None else None
+        if not allow_stale and remaining is not None and remaining < 0:
+            return None
+        return json.loads(value), remaining
+
+    def get(self, key: str, default: Any = None, allow_stale: bool = False) -> Any:
+        entry = self.get_entry(key, allow_stale)
+        return default if entry is None else entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM cache")
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш: быстрый LRU в памяти процесса и необязательный общий уровень (SQLiteCache).
+
+    При чтении сначала проверяется память, затем общий уровень; найденное во втором
+    уровне значение поднимается в память с оставшимся временем жизни, а не с полным TTL.
+    """
+
+    def __init__(self, local: LRUCache, shared: Optional[SQLiteCache] = None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: Any, default: Any = None, allow_stale: bool = False) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.shared is not None:
+            entry = self.shared.get_entry(key)
+            if entry is not None:
+                value, remaining = entry
+                # В памяти запись живет не дольше, чем ей осталось в общем уровне
+                if remaining is not None and self.local.ttl is not None:
+                    remaining = min(remaining, self.local.ttl)
+                self.local.set(key, value, ttl=remaining)
+                return value
+        if allow_stale:
+            value = self.local.get(key, _MISSING, allow_stale=True)
+            if value is _MISSING and self.shared is not None:
+                value = self.shared.get(key, _MISSING, allow_stale=True)
+            if value is not _MISSING:
+                return value
+        return default
+
+    def set(self, key: Any, value: Any) -> None:
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def get_or_set(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """Возвращает значение из кэша, а при промахе вычисляет его через factory и сохраняет."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+
+class PeriodicRefresher:
+    """
+    Фоновый поток, вызывающий функцию обновления с заданным интервалом.
+
+    Ошибки обновления передаются в on_error и не останавливают поток.
+    """
+
+    def __init__(self, func: Callable[[], Any], interval: float, on_error: Optional[Callable] = None):
+        self.func = func
+        self.interval = interval
+        self.on_error = on_error
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.func()
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="periodic-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
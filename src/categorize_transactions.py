@@ -1,6 +1,9 @@
 from collections import Counter
 
+from src.metrics import instrument
 
+
+@instrument("categorize_transactions")
 def categorize_transactions(transactions, categories):
     """
     Подсчитывает количество операций в каждой из заданных категорий.
@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Исключение, выбрасываемое при вызове через разомкнутый предохранитель."""
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для обращений к внешнему API.
+
+    После failure_threshold подряд неудачных вызовов предохранитель размыкается и в течение
+    reset_timeout секунд сразу выбрасывает CircuitOpenError, не обращаясь к API. Затем
+    пропускается один пробный вызов: при успехе предохранитель замыкается, при ошибке снова размыкается.
+
+    :param name: Название внешнего сервиса, используется в сообщениях об ошибках.
+    :param failure_threshold: Количество неудачных вызовов подряд до размыкания.
+    :param reset_timeout: Время в секундах, через которое разрешается пробный вызов.
+    :param is_failure: Функция, определяющая, считать ли исключение отказом сервиса. По умолчанию — любое.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        is_failure: Optional[Callable[[Exception], bool]] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"Сервис {self.name} временно недоступен")
+                self.state = HALF_OPEN
+            elif self.state == HALF_OPEN:
+                # Пробный вызов уже выполняется, остальные не пропускаем
+                raise CircuitOpenError(f"Сервис {self.name} временно недоступен")
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def _on_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Вызывает func через предохранитель."""
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure is None or self.is_failure(e):
+                self._on_failure()
+            else:
+                self._on_success()
+            raise
+        self._on_success()
+        return result
+
+    def reset(self) -> None:
+        """Принудительно замыкает предохранитель."""
+        self._on_success()
@@ -0,0 +1,76 @@
+import gzip
+import os
+
+from flask import request
+
+from src.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson", "text/html", "text/plain", "text/csv"}
+
+# Сжатые тела ответов с ETag (например, из кэша ответов), чтобы не сжимать одно и то же повторно
+compressed_cache = LRUCache(maxsize=256)
+
+
+def _choose_encoding():
+    """Выбирает кодировку сжатия по заголовку Accept-Encoding с учетом доступных библиотек."""
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(supported)
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response, min_size: int = COMPRESS_MIN_SIZE, level: int = COMPRESS_LEVEL):
+    """
+    Сжимает тело ответа gzip или brotli, если клиент это поддерживает и тело не меньше min_size байт.
+
+    Потоковые ответы, ответы без тела и уже сжатые ответы не изменяются. Строгий ETag
+    сжатого ответа становится слабым, так как байты представления отличаются от исходных.
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    etag, weak = response.get_etag()
+    cache_key = (etag, encoding)
+    compressed = compressed_cache.get(cache_key) if etag else None
+    if compressed is None:
+        compressed = _compress(data, encoding, level)
+        if etag:
+            compressed_cache.set(cache_key, compressed)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app, min_size: int = COMPRESS_MIN_SIZE, level: int = COMPRESS_LEVEL) -> None:
+    """Включает сжатие ответов приложения Flask."""
+    app.after_request(lambda response: compress_response(response, min_size, level))
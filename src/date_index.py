@@ -0,0 +1,88 @@
+import bisect
+import functools
+import threading
+from datetime import date, datetime
+from operator import itemgetter
+from typing import Dict, Iterable, List
+
+# Пачка меньше 1/SMALL_BATCH_RATIO размера индекса вставляется поштучно, большая — пересборкой индекса
+SMALL_BATCH_RATIO = 16
+
+
+class TransactionDateIndex:
+    """
+    Транзакции, упорядоченные по заранее разобранной дате, для запросов за период.
+
+    Дата каждой транзакции разбирается один раз при добавлении; запрос за период находит границы
+    двоичным поиском (bisect) и возвращает срез, то есть стоит O(log n + k) вместо просмотра
+    всех транзакций с разбором дат.
+
+    Транзакция — словарь с ключом "date" (YYYY-MM-DD). Транзакции с одинаковой датой
+    сохраняют порядок добавления.
+    """
+
+    def __init__(self, transactions: Iterable[Dict] = ()):
+        self._keys: List[datetime] = []
+        self._transactions: List[Dict] = []
+        self._lock = threading.Lock()
+        self.add_many(transactions)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def _parse_day(value: str) -> datetime:
+        # У многих транзакций общий день, поэтому разобранные даты кэшируются
+        day = date.fromisoformat(value)
+        return datetime(day.year, day.month, day.day)
+
+    def _parse(self, transaction: Dict) -> datetime:
+        return self._parse_day(transaction["date"][:10])
+
+    @staticmethod
+    def _to_datetime(value: date) -> datetime:
+        # Границы периода можно передавать как date, так и datetime
+        if isinstance(value, datetime):
+            return value
+        return datetime(value.year, value.month, value.day)
+
+    def _insert(self, key: datetime, transaction: Dict) -> None:
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._transactions.insert(position, transaction)
+
+    def add(self, transaction: Dict) -> None:
+        key = self._parse(transaction)
+        with self._lock:
+            self._insert(key, transaction)
+
+    def add_many(self, transactions: Iterable[Dict]) -> None:
+        """Добавляет транзакции пачкой: даты разбираются заранее, а индекс пересобирается одной сортировкой.
+
+        Поштучная вставка в середину списка стоит O(n) и на неупорядоченных данных дает O(n²);
+        пересборка — O((n + m) log(n + m)). Только небольшие по сравнению с индексом пачки
+        вставляются поштучно. Порядок транзакций с одинаковой датой сохраняется.
+        """
+        entries = [(self._parse(transaction), transaction) for transaction in transactions]
+        if not entries:
+            return
+        with self._lock:
+            if len(entries) * SMALL_BATCH_RATIO < len(self._keys):
+                # Небольшую пачку дешевле вставить в готовый индекс, чем пересобирать его целиком
+                for key, transaction in entries:
+                    self._insert(key, transaction)
+                return
+            entries = list(zip(self._keys, self._transactions)) + entries
+            entries.sort(key=itemgetter(0))
+            self._keys = [key for key, _ in entries]
+            self._transactions = [transaction for _, transaction in entries]
+
+    def between(self, start_date: date, end_date: date) -> List[Dict]:
+        """Возвращает транзакции с датой от start_date до end_date включительно в порядке дат."""
+        start = self._to_datetime(start_date)
+        end = self._to_datetime(end_date)
+        with self._lock:
+            low = bisect.bisect_left(self._keys, start)
+            high = bisect.bisect_right(self._keys, end)
+            return self._transactions[low:high]
+
+    def __len__(self) -> int:
+        return len(self._transactions)
@@ -1,12 +1,501 @@
+import atexit
+import bisect
 import functools
+import inspect
+import itertools
+import logging
+import math
+import os
+import queue
+import reprlib
+import threading
+import time
+from typing import Dict, Optional
 
+# Максимальное количество записей, которое фоновый поток записывает за один раз
+MAX_BATCH_SIZE = 1024
+# Максимальное количество записей в очереди фоновой записи
+MAX_QUEUE_SIZE = 65536
+# Как часто flush проверяет, что фоновый поток еще работает, в секундах
+FLUSH_POLL_INTERVAL = 0.1
 
-def log(filename):
+_reprs: Dict[int, reprlib.Repr] = {}
+
+
+def _short_repr(value, max_repr: int) -> str:
+    """Представление значения не длиннее max_repr символов.
+
+    reprlib ограничивает количество элементов коллекций, поэтому большие списки транзакций
+    не форматируются целиком.
+    """
+    short = _reprs.get(max_repr)
+    if short is None:
+        short = reprlib.Repr()
+        short.maxstring = short.maxother = max_repr
+        short.maxlist = short.maxtuple = short.maxdict = short.maxset = max(max_repr // 8, 1)
+        _reprs[max_repr] = short
+    text = short.repr(value)
+    return text if len(text) <= max_repr else text[: max(max_repr - 3, 0)] + "..."
+
+
+def _format_values(args, kwargs, max_repr):
+    if max_repr is None:
+        return f"{args}, {kwargs}"
+    return f"{_short_repr(args, max_repr)}, {_short_repr(kwargs, max_repr)}"
+
+
+def _format_elapsed(func_name, elapsed):
+    if elapsed is None:
+        return ""
+    wall, cpu = elapsed
+    if cpu is None:
+        return f"Функция: {func_name} выполнена за {wall * 1000:.3f} мс\n"
+    return f"Функция: {func_name} выполнена за {wall * 1000:.3f} мс (CPU {cpu * 1000:.3f} мс)\n"
+
+
+def _format_call(func_name, args, kwargs, result, max_repr=None, elapsed=None):
+    result = result if max_repr is None else _short_repr(result, max_repr)
+    return (
+        f"Запуск функции: {func_name} с аргументами: {_format_values(args, kwargs, max_repr)}\n"
+        f"Функция: {func_name} вернула: {result}\n" + _format_elapsed(func_name, elapsed)
+    )
+
+
+def _format_error(func_name, args, kwargs, max_repr=None, elapsed=None):
+    return (
+        f"Ошибка в функции: {func_name} с аргументами: {_format_values(args, kwargs, max_repr)}\n"
+        + _format_elapsed(func_name, elapsed)
+    )
+
+
+class _Histogram:
+    """
+    Гистограмма длительностей с логарифмическими корзинами (шаг 20%, от 1 мкс до ~40 минут).
+
+    Память фиксирована, запись стоит O(log k). Перцентиль возвращается как верхняя граница
+    корзины, то есть с погрешностью не более 20%, но не больше максимального значения.
+    """
+
+    BOUNDS = [1e-6 * 1.2**i for i in range(120)]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        index = bisect.bisect_left(self.BOUNDS, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(math.ceil(q * self.count), 1)
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= rank:
+                    break
+            bound = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+            return min(bound, self.max)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "total": self.total,
+        }
+
+
+# Гистограммы времени выполнения: имя функции -> {"wall": ..., "cpu": ...}
+_timings: Dict[str, Dict[str, _Histogram]] = {}
+_timings_lock = threading.Lock()
+
+
+def _get_timings(name: str) -> Dict[str, _Histogram]:
+    with _timings_lock:
+        histograms = _timings.get(name)
+        if histograms is None:
+            histograms = _timings[name] = {"wall": _Histogram(), "cpu": _Histogram()}
+        return histograms
+
+
+def timing_summary() -> Dict[str, Dict]:
+    """
+    Сводка времени выполнения функций, декорированных log(..., timing=True).
+
+    Для каждой функции (модуль.имя) возвращает количество измеренных вызовов и перцентили
+    p50/p95/p99, максимум и сумму настенного (wall) и процессорного (cpu) времени в секундах.
+    При выборочном измерении (sample_rate) count учитывает только измеренные вызовы.
+    """
+    with _timings_lock:
+        items = list(_timings.items())
+    return {
+        name: {
+            "count": histograms["wall"].count,
+            "wall": histograms["wall"].summary(),
+            "cpu": histograms["cpu"].summary(),
+        }
+        for name, histograms in items
+    }
+
+
+def dump_timings(filename: Optional[str] = None) -> str:
+    """Формирует текстовую сводку времени выполнения и, если задан filename, дописывает ее в файл."""
+    lines = []
+    for name, stats in sorted(timing_summary().items()):
+        wall, cpu = stats["wall"], stats["cpu"]
+        lines.append(
+            f"{name}: вызовов {stats['count']}, "
+            f"wall p50 {wall['p50'] * 1000:.3f} мс, p95 {wall['p95'] * 1000:.3f} мс, "
+            f"p99 {wall['p99'] * 1000:.3f} мс, max {wall['max'] * 1000:.3f} мс, "
+            f"cpu p50 {cpu['p50'] * 1000:.3f} мс, max {cpu['max'] * 1000:.3f} мс\n"
+        )
+    text = "".join(lines)
+    if filename is not None:
+        _write(filename, str, text)
+    return text
+
+
+def reset_timings() -> None:
+    with _timings_lock:
+        _timings.clear()
+
+
+class _BufferedLogWriter:
+    """
+    Фоновая запись журнала в долгоживущий файл.
+
+    Вызовы декорированных функций только кладут запись в очередь; форматирование и запись
+    в файл выполняет фоновый поток пачками не реже чем раз в flush_interval секунд.
+    Очередь ограничена MAX_QUEUE_SIZE записями: если поток не успевает, вызовы ждут места в очереди.
+    Асинхронные функции ставят записи через put_nowait и не ждут: при переполненной очереди запись
+    отбрасывается и учитывается в счетчике dropped.
+
+    Для put файл открывается в вызывающем потоке, поэтому ошибка открытия (например, нет каталога)
+    поднимается в вызове, как при синхронной записи; для put_nowait файл открывает фоновый поток,
+    а ошибка открытия попадает в журнал приложения. Если запись в файл завершилась ошибкой,
+    поток дописывает оставшиеся записи синхронно и останавливается, а следующий вызов
+    открывает файл и запускает поток заново.
+
+    После fork (например, в воркерах gunicorn) поток и очередь создаются заново. Если файл был
+    удален или переименован (ротация журналов), он открывается заново, как в logging.WatchedFileHandler.
+    """
+
+    def __init__(self, filename: str, flush_interval: float):
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(MAX_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def _running(self) -> bool:
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def _ensure_started(self, open_in_caller: bool = True) -> None:
+        if self._running():
+            return
+        with self._lock:
+            if not self._running():
+                # Записи, унаследованные от родительского процесса, запишет сам родитель
+                file = open(self.filename, "a") if open_in_caller else None
+                self._queue = queue.Queue(MAX_QUEUE_SIZE)
+                self._thread = threading.Thread(
+                    target=self._run, args=(file, self._queue), name="log-writer", daemon=True
+                )
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def put(self, formatter, *args) -> None:
+        """Ставит запись в очередь. formatter(*args) вызывается фоновым потоком и возвращает текст."""
+        self._ensure_started()
+        records = self._queue
+        records.put((formatter, args))
+        if records is not self._queue or self._pid is None:
+            self._drain([], records)  # Фоновый поток остановился, пока запись ставилась в очередь
+
+    def put_nowait(self, formatter, *args) -> None:
+        """Как put, но без ожидания и файлового ввода-вывода в вызывающем потоке (для цикла событий)."""
+        self._ensure_started(open_in_caller=False)
+        records = self._queue
+        try:
+            records.put_nowait((formatter, args))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        if records is not self._queue or self._pid is None:
+            threading.Thread(target=self._drain, args=([], records), name="log-drain", daemon=True).start()
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Дожидается записи в файл всех поставленных в очередь записей (не дольше timeout секунд)."""
+        if not self._running():
+            return
+        written = threading.Event()
+        try:
+            self._queue.put(written, timeout=timeout)
+        except queue.Full:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        thread = self._thread
+        # Поток мог остановиться из-за ошибки записи — тогда ждать нечего
+        while not written.wait(FLUSH_POLL_INTERVAL) and thread.is_alive():
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+
+    def _next_batch(self, records: "queue.Queue") -> list:
+        batch = [records.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < MAX_BATCH_SIZE and not isinstance(batch[-1], threading.Event):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(records.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _reopen_if_moved(self, file):
+        try:
+            current = os.stat(self.filename)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(file.fileno())
+        if current is None or (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+            file.close()
+            file = open(self.filename, "a")
+        return file
+
+    @staticmethod
+    def _format_record(record) -> str:
+        formatter, args = record
+        try:
+            return formatter(*args)
+        except Exception as e:  # Ошибка форматирования не должна останавливать запись журнала
+            return f"Ошибка записи журнала: {e!r}\n"
+
+    def _run(self, file, records: "queue.Queue") -> None:
+        batch, written, waiters = [], 0, []
+        try:
+            if file is None:
+                file = open(self.filename, "a")
+            while True:
+                batch, written, waiters = self._next_batch(records), 0, []
+                if not all(isinstance(record, threading.Event) for record in batch):
+                    # Пустой сброс не должен заново создавать удаленный файл журнала
+                    file = self._reopen_if_moved(file)
+                for record in batch:
+                    if isinstance(record, threading.Event):
+                        waiters.append(record)
+                    else:
+                        file.write(self._format_record(record))
+                    written += 1
+                file.flush()
+                for waiter in waiters:
+                    waiter.set()
+        except Exception as e:
+            logging.getLogger(__name__).error("Фоновая запись журнала %s остановлена: %r", self.filename, e)
+        finally:
+            try:
+                if file is not None:
+                    file.close()
+            except OSError:
+                pass
+            for waiter in waiters:
+                waiter.set()
+            with self._lock:
+                if self._queue is records:
+                    self._pid = None
+            # Новые вызовы уже запускают новый поток (_running() ложно), а оставшиеся в очереди
+            # записи дописываются синхронно, чтобы не потерять их и не оставить flush ждать
+            self._drain(batch[written:], records)
+
+    def _drain(self, batch, records: "queue.Queue") -> None:
+        while True:
+            for record in batch:
+                if isinstance(record, threading.Event):
+                    record.set()
+                    continue
+                try:
+                    with open(self.filename, "a") as file:
+                        file.write(self._format_record(record))
+                except OSError:
+                    pass  # Файл по-прежнему недоступен; следующий вызов получит ошибку открытия
+            try:
+                batch = [records.get_nowait()]
+            except queue.Empty:
+                return
+
+
+_writers: Dict[str, _BufferedLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(filename: str, flush_interval: float) -> _BufferedLogWriter:
+    with _writers_lock:
+        writer = _writers.get(filename)
+        if writer is None:
+            writer = _writers[filename] = _BufferedLogWriter(filename, flush_interval)
+        return writer
+
+
+def flush_logs(timeout: Optional[float] = None) -> None:
+    """Дожидается записи всех буферизованных журналов в файлы."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush(timeout)
+
+
+def dropped_log_records() -> Dict[str, int]:
+    """Количество записей журнала, отброшенных асинхронными вызовами из-за переполненной очереди, по файлам."""
+    with _writers_lock:
+        return {filename: writer.dropped for filename, writer in _writers.items()}
+
+
+atexit.register(flush_logs, 5)
+
+
+def _write(filename, formatter, *args):
+    with open(filename, "a") as file:
+        file.write(formatter(*args))
+
+
+def _logged(func, write, sample_rate, max_repr):
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if write is None or (sample_rate > 1 and next(calls) % sample_rate):
+            return func(*args, **kwargs)
+        try:
+            result = func(*args, **kwargs)
+            write(_format_call, func.__name__, args, kwargs, result, max_repr)
+            return result
+        except Exception as e:
+            write(_format_error, func.__name__, args, kwargs, max_repr)
+            raise e
+
+    return wrapper
+
+
+def _timed(func, write, sample_rate, max_repr, histograms):
+    calls = itertools.count()
+    wall_histogram, cpu_histogram = histograms["wall"], histograms["cpu"]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if sample_rate > 1 and next(calls) % sample_rate:
+            return func(*args, **kwargs)
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            elapsed = (time.perf_counter() - started, time.thread_time() - cpu_started)
+            wall_histogram.record(elapsed[0])
+            cpu_histogram.record(elapsed[1])
+            if write is not None:
+                write(_format_error, func.__name__, args, kwargs, max_repr, elapsed)
+            raise e
+        elapsed = (time.perf_counter() - started, time.thread_time() - cpu_started)
+        wall_histogram.record(elapsed[0])
+        cpu_histogram.record(elapsed[1])
+        if write is not None:
+            write(_format_call, func.__name__, args, kwargs, result, max_repr, elapsed)
+        return result
+
+    return wrapper
+
+
+def _async_logged(func, write, sample_rate, max_repr, wall_histogram):
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if (write is None and wall_histogram is None) or (sample_rate > 1 and next(calls) % sample_rate):
+            return await func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            elapsed = _record_async_elapsed(started, wall_histogram)
+            if write is not None:
+                write(_format_error, func.__name__, args, kwargs, max_repr, elapsed)
+            raise e
+        elapsed = _record_async_elapsed(started, wall_histogram)
+        if write is not None:
+            write(_format_call, func.__name__, args, kwargs, result, max_repr, elapsed)
+        return result
+
+    return wrapper
+
+
+def _async_gen_logged(func, write, sample_rate, max_repr, wall_histogram):
+    calls = itertools.count()
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if (write is None and wall_histogram is None) or (sample_rate > 1 and next(calls) % sample_rate):
+            async for item in func(*args, **kwargs):
+                yield item
+            return
+        started = time.perf_counter()
+        produced = 0
+        try:
+            async for item in func(*args, **kwargs):
+                produced += 1
+                yield item
+        except Exception as e:
+            elapsed = _record_async_elapsed(started, wall_histogram)
+            if write is not None:
+                write(_format_error, func.__name__, args, kwargs, max_repr, elapsed)
+            raise e
+        elapsed = _record_async_elapsed(started, wall_histogram)
+        if write is not None:
+            write(_format_call, func.__name__, args, kwargs, f"элементов: {produced}", max_repr, elapsed)
+
+    return wrapper
+
+
+def _record_async_elapsed(started, wall_histogram):
+    # Процессорное время потока во время await включает работу других задач цикла событий,
+    # поэтому для асинхронных функций измеряется только настенное время
+    if wall_histogram is None:
+        return None
+    wall = time.perf_counter() - started
+    wall_histogram.record(wall)
+    return wall, None
+
+
+def log(filename, buffered=False, flush_interval=1.0, timing=False, sample_rate=1, max_repr=None):
     """
     Декоратор для логирования вызовов функции.
 
     Параметры:
-    filename (str): Имя файла, в который будут записываться логи вызовов функции.
+    filename (str): Имя файла, в который будут записываться логи вызовов функции. None — не записывать
+        вызовы (например, только измерять время с timing=True).
+    buffered (bool): Писать журнал в фоновом потоке. Вызов функции только ставит запись в очередь,
+        файл открывается один раз, а записи сбрасываются пачками. Аргументы и результат форматируются
+        при записи, поэтому изменения изменяемых аргументов после вызова могут попасть в журнал.
+        Дождаться записи можно функцией flush_logs().
+    flush_interval (float): Максимальная задержка записи в буферизованном режиме, в секундах.
+    timing (bool): Измерять настенное и процессорное время вызова. Время добавляется в журнал и
+        накапливается в гистограммах, сводку которых возвращают timing_summary() и dump_timings().
+    sample_rate (int): Логировать и измерять только каждый N-й вызов (1 — все вызовы).
+    max_repr (int): Ограничение длины записи аргументов и результата в символах. None — без ограничения.
 
     Возвращает:
     function: Обернутая функция с добавленным функционалом логирования.
@@ -14,22 +503,29 @@ def log(filename):
     Логирование включает:
     - Запись имени функции, переданных аргументов и возвращаемого значения при успешном выполнении.
     - Запись информации об ошибке, если возникает исключение, включая имя функции и переданные аргументы.
+
+    Корутины и асинхронные генераторы оборачиваются асинхронно: журнал получает результат await
+    (для генератора — количество выданных элементов) и длительность до завершения. Запись для них
+    всегда идет через фоновый поток без ожидания места в очереди, чтобы не блокировать цикл событий:
+    при переполненной очереди запись отбрасывается. Измеряется только настенное время.
     """
+    if sample_rate < 1:
+        raise ValueError("sample_rate должен быть положительным числом")
+    if filename is None:
+        write = None
+    elif buffered:
+        write = _get_writer(filename, flush_interval).put
+    else:
+        write = functools.partial(_write, filename)
 
     def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            try:
-                result = func(*args, **kwargs)
-                with open(filename, "a") as file:
-                    file.write(f"Запуск функции: {func.__name__} с аргументами: {args}, {kwargs}\n")
-                    file.write(f"Функция: {func.__name__} вернула: {result}\n")
-                return result
-            except Exception as e:
-                with open(filename, "a") as file:
-                    file.write(f"Ошибка в функции: {func.__name__} с аргументами: {args}, {kwargs}\n")
-                raise e
-
-        return wrapper
+        if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+            async_write = None if filename is None else _get_writer(filename, flush_interval).put_nowait
+            wall_histogram = _get_timings(f"{func.__module__}.{func.__qualname__}")["wall"] if timing else None
+            wrap = _async_logged if inspect.iscoroutinefunction(func) else _async_gen_logged
+            return wrap(func, async_write, sample_rate, max_repr, wall_histogram)
+        if not timing:
+            return _logged(func, write, sample_rate, max_repr)
+        return _timed(func, write, sample_rate, max_repr, _get_timings(f"{func.__module__}.{func.__qualname__}"))
 
     return decorator
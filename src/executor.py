@@ -0,0 +1,81 @@
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusyError(RuntimeError):
+    """Исключение, выбрасываемое, когда очередь пула задач заполнена."""
+
+
+class WorkerExecutor:
+    """
+    Долгоживущий ограниченный пул потоков, общий для всех запросов процесса-воркера.
+
+    Пул создается лениво при первой задаче и заново после fork (например, в воркерах gunicorn
+    с --preload), поскольку потоки родительского процесса в дочернем не существуют.
+    Количество одновременно принятых задач ограничено max_workers + max_queue: при переполнении
+    submit сразу выбрасывает ExecutorBusyError, а не копит очередь.
+
+    :param max_workers: Количество потоков в пуле.
+    :param max_queue: Количество задач, которые могут ожидать свободного потока.
+    """
+
+    def __init__(self, max_workers: int = 16, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="worker-executor"
+                )
+                self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+                self._pid = os.getpid()
+            return self._executor
+
+    def submit(self, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """Ставит задачу в пул. Выбрасывает ExecutorBusyError, если пул и очередь заполнены."""
+        executor = self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise ExecutorBusyError("Пул задач перегружен")
+
+        def task():
+            # Место освобождается до того, как future станет завершенным, чтобы ожидающий результата
+            # вызывающий код сразу мог поставить следующую задачу
+            try:
+                return func(*args, **kwargs)
+            finally:
+                slots.release()
+
+        try:
+            future = executor.submit(task)
+        except Exception:
+            slots.release()
+            raise
+        # Отмененная до запуска задача не выполнится, поэтому место освобождаем здесь
+        future.add_done_callback(lambda done: done.cancelled() and slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Завершает пул: ожидающие задачи отменяются, выполняющиеся — дожидаются при wait=True."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            logger.info("Shutting down worker executor")
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def register_shutdown(executor: WorkerExecutor) -> None:
+    """Регистрирует корректное завершение пула при выходе из процесса."""
+    atexit.register(executor.shutdown)
@@ -1,7 +1,10 @@
 import re
 from typing import Dict, List
 
+from src.metrics import instrument
 
+
+@instrument("filter_by_transactions")
 def filter_by_transactions(transactions: List[Dict[str, any]], search_term: str) -> List[Dict[str, any]]:
     """
     Фильтрует список банковских операций по заданной строке поиска.
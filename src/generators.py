@@ -1,4 +1,15 @@
-from typing import Dict, Generator, List, Union
+from collections import defaultdict
+from typing import Dict, Generator, Iterable, Iterator, List, Tuple, Union
+
+from src.metrics import instrument
+
+try:
+    import numpy as np
+except ImportError:  # numpy — необязательная зависимость, нужна только для card_number_chunks(as_numpy=True)
+    np = None
+
+# Удвоенная цифра с вычитанием 9 для алгоритма Луна
+LUHN_DOUBLED = [0, 2, 4, 6, 8, 1, 3, 5, 7, 9]
 
 transactions = [
     {
@@ -32,39 +43,158 @@ transactions = [
 ]
 
 
-def filter_by_currency(transactions: List[Dict], currency: str) -> Generator[Union[Dict, str], None, None]:
-    """Функция возвращает итератор, который поочередно выдает транзакции, где валюта операции соответствует заданной"""
-    found = False  # Флаг для отслеживания найденных транзакций
-    for operation_in_transaction in transactions:
-        if (
-            operation_in_transaction
-            and operation_in_transaction.get("operationAmount", {}).get("currency", {}).get("name") == currency
-        ):
-            found = True
-            yield operation_in_transaction
+def get_currency_code(transaction: Dict) -> Union[str, None]:
+    """Функция возвращает код валюты операции как для вложенного формата JSON (operationAmount.currency.code),
+    так и для плоского формата CSV/XLSX (currency_code)"""
+    if "currency_code" in transaction:
+        return transaction["currency_code"]
+    return transaction.get("operationAmount", {}).get("currency", {}).get("code")
+
 
-    if not found:
-        yield "Нет значений"  # Возвращаем строку, если ничего не найдено
+def get_currency_name(transaction: Dict) -> Union[str, None]:
+    """Функция возвращает название валюты операции как для вложенного формата JSON (operationAmount.currency.name),
+    так и для плоского формата CSV/XLSX (currency_name)"""
+    if "currency_name" in transaction:
+        return transaction["currency_name"]
+    return transaction.get("operationAmount", {}).get("currency", {}).get("name")
 
 
-def transaction_descriptions(transactions: List[Dict]) -> Generator[str, None, None]:
-    """Функция принимает список словарей с транзакциями и возвращает описание каждой операции по очереди."""
-    # Проверяем, если список пустой
-    if not transactions:
-        yield "Нет значений"
+@instrument("filter_by_currency")
+def filter_by_currency(transactions: Iterable[Dict], currency: str) -> Iterator[Dict]:
+    """Функция возвращает итератор, который поочередно выдает транзакции, где валюта операции соответствует заданной
+    (по названию или коду валюты).
 
+    Принимает любой итерируемый источник, в том числе генераторы потоковых загрузчиков, и не строит
+    промежуточных списков. Если подходящих транзакций нет, итератор пуст."""
     for transaction in transactions:
-        if not transaction:  # Проверяем пустую транзакцию
-            yield "Описание отсутствует"
+        if isinstance(transaction, dict) and transaction:
+            if currency in (get_currency_name(transaction), get_currency_code(transaction)):
+                yield transaction
+
+
+@instrument("group_by_currency")
+def group_by_currency(
+    transactions: Iterable[Dict], currencies: Union[Iterable[str], None] = None
+) -> Dict[str, List[Dict]]:
+    """Функция за один проход раскладывает транзакции по кодам валют и возвращает словарь {код: [транзакции]}.
+
+    Поддерживаются вложенный формат JSON (operationAmount.currency.code) и плоский формат CSV/XLSX
+    (currency_code). Если задан currencies, собираются только эти валюты; пустые записи и транзакции
+    без кода валюты пропускаются. Порядок транзакций внутри группы сохраняется."""
+    wanted = set(currencies) if currencies is not None else None
+    groups = defaultdict(list)
+    for transaction in transactions:
+        if not isinstance(transaction, dict) or not transaction:
+            continue
+        code = get_currency_code(transaction)
+        if code is None or (wanted is not None and code not in wanted):
             continue
+        groups[code].append(transaction)
+    return dict(groups)
+
 
-        description = transaction.get("description")
+def transaction_descriptions(transactions: Iterable[Dict]) -> Iterator[str]:
+    """Функция принимает итерируемый источник транзакций и возвращает описание каждой операции по очереди.
+    Для пустого источника итератор пуст."""
+    for transaction in transactions:
+        description = transaction.get("description") if isinstance(transaction, dict) else None
         yield description if description else "Описание отсутствует"
 
 
-def card_number_generator(start: int, stop: int) -> Generator[str, None, None]:
-    """Генератор, который выдает номера банковских карт в формате: XXXX XXXX XXXX XXXX."""
-    for number in range(start, stop + 1):
-        yield f"{number:016d}"[:4] + " " + f"{number:016d}"[4:8] + " " + f"{number:016d}"[
-            8:12
-        ] + " " + f"{number:016d}"[12:]
+def luhn_check_digit(number: int) -> int:
+    """Функция возвращает контрольную цифру Луна, которую нужно дописать к number справа"""
+    digits = str(number)
+    # Удваиваются цифры через одну, начиная с ближайшей к контрольной
+    total = sum(LUHN_DOUBLED[int(digit)] for digit in digits[::-2]) + sum(int(digit) for digit in digits[-2::-2])
+    return (10 - total % 10) % 10
+
+
+def _luhn_numbers(start: int, stop: int) -> Generator[int, None, None]:
+    # В каждом десятке [10p, 10p + 9] ровно один номер с верной контрольной суммой: 10p + контрольная цифра p
+    for prefix in range(max(start, 0) // 10, stop // 10 + 1):
+        number = prefix * 10 + luhn_check_digit(prefix)
+        if start <= number <= stop:
+            yield number
+
+
+def card_number_generator(start: int, stop: int, luhn_only: bool = False) -> Generator[str, None, None]:
+    """Генератор, который выдает номера банковских карт в формате: XXXX XXXX XXXX XXXX.
+
+    С luhn_only=True выдаются только номера с верной контрольной суммой Луна (каждый десятый)."""
+    for number in _luhn_numbers(start, stop) if luhn_only else range(start, stop + 1):
+        digits = f"{number:016d}"
+        yield f"{digits[:4]} {digits[4:8]} {digits[8:12]} {digits[12:]}"
+
+
+def _numpy_card_numbers(numbers):
+    """Форматирует массив номеров в массив строк XXXX XXXX XXXX XXXX без цикла по номерам"""
+    powers = 10 ** np.arange(15, -1, -1, dtype=np.int64)
+    digits = (numbers[:, None] // powers % 10).astype(np.uint8) + ord("0")
+    formatted = np.full((len(numbers), 19), ord(" "), dtype=np.uint8)
+    for group in range(4):
+        formatted[:, group * 5 : group * 5 + 4] = digits[:, group * 4 : group * 4 + 4]
+    return formatted.view("S19").ravel().astype("U19")
+
+
+def _numpy_luhn_numbers(prefixes):
+    """Векторный расчет номеров с верной контрольной суммой Луна по массиву префиксов"""
+    powers = 10 ** np.arange(14, -1, -1, dtype=np.int64)
+    digits = prefixes[:, None] // powers % 10
+    # Удваиваются цифры на четных позициях справа (последняя цифра префикса — позиция 0)
+    doubled = np.array(LUHN_DOUBLED, dtype=np.int64)[digits[:, 14::-2]]
+    total = doubled.sum(axis=1) + digits[:, 13::-2].sum(axis=1)
+    return prefixes * 10 + (10 - total % 10) % 10
+
+
+def card_number_chunks(
+    start: int, stop: int, chunk_size: int = 100_000, luhn_only: bool = False, as_numpy: bool = False
+) -> Generator:
+    """Генератор, который выдает номера карт из диапазона [start, stop] пачками не больше chunk_size.
+
+    Пачка — список строк или, с as_numpy=True, массив NumPy строк (требуется numpy), который
+    форматируется векторно. С luhn_only=True выдаются только номера с верной контрольной суммой Луна."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size должен быть положительным числом")
+    if not as_numpy:
+        chunk = []
+        for card_number in card_number_generator(start, stop, luhn_only):
+            chunk.append(card_number)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    if np is None:
+        raise ImportError("Для as_numpy=True требуется пакет numpy")
+    if luhn_only:
+        # Пачка префиксов дает не больше chunk_size номеров
+        for prefix_start in range(max(start, 0) // 10, stop // 10 + 1, chunk_size):
+            prefix_stop = min(prefix_start + chunk_size, stop // 10 + 1)
+            numbers = _numpy_luhn_numbers(np.arange(prefix_start, prefix_stop, dtype=np.int64))
+            numbers = numbers[(numbers >= start) & (numbers <= stop)]
+            if len(numbers):
+                yield _numpy_card_numbers(numbers)
+        return
+    for chunk_start in range(start, stop + 1, chunk_size):
+        yield _numpy_card_numbers(np.arange(chunk_start, min(chunk_start + chunk_size, stop + 1), dtype=np.int64))
+
+
+def card_number_shards(start: int, stop: int, shards: int) -> List[Tuple[int, int]]:
+    """Функция делит диапазон [start, stop] на shards непересекающихся диапазонов примерно равного размера
+    для параллельной генерации, например card_number_generator(*shard) в пуле процессов"""
+    if shards <= 0:
+        raise ValueError("shards должен быть положительным числом")
+    total = stop - start + 1
+    if total <= 0:
+        return []
+    shards = min(shards, total)
+    size, extra = divmod(total, shards)
+    ranges = []
+    shard_start = start
+    for index in range(shards):
+        shard_stop = shard_start + size + (1 if index < extra else 0) - 1
+        ranges.append((shard_start, shard_stop))
+        shard_start = shard_stop + 1
+    return ranges
@@ -0,0 +1,59 @@
+import functools
+import hashlib
+import os
+
+from flask import make_response, request
+
+from src.cache import LRUCache
+
+# Кэш готовых ответов: ключ — маршрут и нормализованные параметры запроса
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+response_cache = LRUCache(maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "512")), ttl=RESPONSE_CACHE_TTL)
+
+
+def _cache_key() -> tuple:
+    """Ключ кэша: путь запроса и параметры, отсортированные по имени и значению."""
+    return request.path, tuple(sorted(request.args.items(multi=True)))
+
+
+def uncacheable(response):
+    """Помечает ответ как не подлежащий кэшированию (например, неполные данные при сбое внешнего API)."""
+    response.cache_control.no_store = True
+    return response
+
+
+def cached_response(ttl: float = RESPONSE_CACHE_TTL):
+    """
+    Декоратор маршрута Flask, кэширующий успешные ответы и поддерживающий условные GET-запросы.
+
+    Ответ со статусом 200, не помеченный функцией uncacheable, сохраняется в кэше на ttl секунд
+    вместе со строгим ETag (хэш тела).
+    Повторный запрос с тем же маршрутом и параметрами отдается из кэша без вызова обработчика,
+    а запрос с совпадающим If-None-Match получает 304 без тела.
+
+    :param ttl: Время жизни ответа в кэше, в секундах.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = _cache_key()
+            entry = response_cache.get(key)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed or response.cache_control.no_store:
+                    return response
+                body = response.get_data()
+                entry = (body, response.content_type, hashlib.sha256(body).hexdigest())
+                response_cache.set(key, entry, ttl=ttl)
+
+            body, content_type, etag = entry
+            response = make_response(body, 200)
+            response.content_type = content_type
+            response.set_etag(etag)
+            response.cache_control.max_age = int(ttl)
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
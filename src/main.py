@@ -2,7 +2,7 @@ import os
 from typing import Dict, List
 
 from src.filter_transactions import filter_by_transactions
-from src.generators import filter_by_currency
+from src.generators import filter_by_currency, group_by_currency
 from src.processing import filter_by_state, sort_by_date
 from src.transactions_csv import get_financial_transactions
 from src.transactions_xlsx import get_financial_transactions_operations
@@ -31,6 +31,15 @@ def print_transactions(transactions: List[Dict[str, any]]):
         print("Не найдено ни одной транзакции, подходящей под ваши условия фильтрации.")
 
 
+def print_currency_summary(transactions: List[Dict[str, any]]):
+    """Выводит количество операций выборки по каждой валюте (группировка за один проход)"""
+    groups = group_by_currency(transactions)
+    if groups:
+        print("Операции по валютам:")
+        for currency_code, currency_transactions in sorted(groups.items(), key=lambda item: -len(item[1])):
+            print(f"{currency_code}: {len(currency_transactions)}")
+
+
 def get_transaction_choice():
     print("Выберите необходимый пункт меню:")
     print("1. Получить информацию о транзакциях из JSON-файла")
@@ -99,6 +108,7 @@ def main():
 
     print("Распечатываю итоговый список транзакций...")
     print_transactions(filtered_transactions)
+    print_currency_summary(filtered_transactions)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,304 @@
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# Границы корзин гистограмм по умолчанию, в секундах
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames) or set(labels) != set(self.labelnames):
+            raise ValueError(f"Метрика {self.name} ожидает метки {self.labelnames}, получены {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        """Возвращает строки вида (суффикс имени, метки, значение)."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", list(zip(self.labelnames, key)), value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик (например, количество вызовов)."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Счетчик может только увеличиваться")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Текущее значение, которое может как расти, так и уменьшаться (например, запросы в обработке)."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Распределение значений (например, длительностей) по накопительным корзинам, как в Prometheus."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Счетчики по корзинам (последняя — +Inf), сумма и количество наблюдений
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def sum(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0.0
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, ([*state[0]], state[1], state[2])) for key, state in self._values.items()]
+        for key, (bucket_counts, total, count) in items:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), bucket_counts):
+                cumulative += bucket_count
+                yield "_bucket", labels + [("le", _format_value(float(bound)))], cumulative
+            yield "_sum", labels, total
+            yield "_count", labels, count
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса с выводом в текстовом формате Prometheus.
+
+    Метрики создаются по имени при первом обращении; повторное обращение возвращает ту же метрику.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Tuple[str, ...], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Метрика {name} уже зарегистрирована с типом {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets: Tuple = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "".join(metric.render() for metric in metrics)
+
+    def reset(self) -> None:
+        """Обнуляет значения всех метрик (метрики остаются зарегистрированными)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+stage_duration = registry.histogram(
+    "stage_duration_seconds", "Длительность этапа обработки данных, в секундах", ("stage",)
+)
+stage_calls = registry.counter("stage_calls_total", "Количество вызовов этапа обработки данных", ("stage", "status"))
+stage_items = registry.counter("stage_items_total", "Количество записей, возвращенных этапом обработки", ("stage",))
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса, в секундах", ("method", "route")
+)
+http_requests = registry.counter(
+    "http_requests_total", "Количество обработанных HTTP-запросов", ("method", "route", "status")
+)
+http_requests_in_progress = registry.gauge("http_requests_in_progress", "Количество запросов в обработке")
+
+
+def _count_items(result) -> Optional[int]:
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def instrument(stage: str):
+    """
+    Декоратор для измерения этапа обработки: длительность вызова, количество вызовов по статусу
+    (ok/error) и количество возвращенных записей (длина результата).
+
+    Для функций-генераторов измеряется только время работы самого генератора (суммарное время
+    получения элементов, без времени потребителя между ними), а записи считаются по выданным
+    элементам. Вызов учитывается при завершении генератора: досрочное закрытие потребителем
+    (GeneratorExit) считается успешным вызовом, исключение внутри генератора — ошибкой.
+    """
+
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                generator = func(*args, **kwargs)
+                elapsed, produced, status = 0.0, 0, "ok"
+                try:
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                        finally:
+                            elapsed += time.perf_counter() - started
+                        produced += 1
+                        yield item
+                except Exception:
+                    status = "error"
+                    raise
+                finally:
+                    generator.close()
+                    stage_duration.observe(elapsed, stage=stage)
+                    stage_items.inc(produced, stage=stage)
+                    stage_calls.inc(stage=stage, status=status)
+
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                stage_calls.inc(stage=stage, status="error")
+                raise
+            finally:
+                stage_duration.observe(time.perf_counter() - started, stage=stage)
+            stage_calls.inc(stage=stage, status="ok")
+            items = _count_items(result)
+            if items is not None:
+                stage_items.inc(items, stage=stage)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def init_metrics(app) -> None:
+    """Подключает учет HTTP-запросов (по шаблону маршрута) и маршрут /metrics в формате Prometheus."""
+    # Flask импортируется здесь, чтобы загрузчики данных могли использовать instrument без веб-зависимостей
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_in_progress = True
+        http_requests_in_progress.inc()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            http_request_duration.observe(time.perf_counter() - started, method=request.method, route=route)
+            http_requests.inc(method=request.method, route=route, status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def _finish_request(exc=None):
+        if g.pop("metrics_in_progress", False):
+            http_requests_in_progress.dec()
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
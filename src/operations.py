@@ -0,0 +1,55 @@
+import heapq
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+# Путь к выгрузке операций банка (можно переопределить переменной окружения OPERATIONS_PATH)
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERATIONS_PATH = os.getenv("OPERATIONS_PATH", os.path.join(base_dir, "data/operations.xlsx"))
+
+TOP_TRANSACTIONS_COUNT = 5
+
+
+def load_operations(path: str) -> List[Dict]:
+    """Функция читает выгрузку операций банка из Excel и возвращает список словарей
+    с датой, номером карты, статусом, суммой, категорией и описанием каждой операции"""
+    df = pd.read_excel(path)
+    operations = []
+
+    for row in df.to_dict("records"):
+        card_number = row.get("Номер карты")
+        operations.append(
+            {
+                "date": datetime.strptime(row["Дата операции"], "%d.%m.%Y %H:%M:%S").strftime("%Y-%m-%d"),
+                "card_number": "" if pd.isna(card_number) else str(card_number),
+                "status": row.get("Статус", "OK"),
+                "amount": float(row["Сумма платежа"]),
+                "category": "" if pd.isna(row.get("Категория")) else row["Категория"],
+                "description": "" if pd.isna(row.get("Описание")) else row["Описание"],
+            }
+        )
+
+    return operations
+
+
+def top_transactions(operations: Iterable[Dict], count: int = TOP_TRANSACTIONS_COUNT) -> List[Dict]:
+    """Функция возвращает count успешных операций с наибольшей суммой платежа (по модулю).
+
+    Операция без статуса считается успешной, как в load_operations. Сумма возвращается по модулю.
+    Использует кучу (heapq.nlargest), поэтому не сортирует весь список операций."""
+    largest = heapq.nlargest(
+        count,
+        (operation for operation in operations if operation.get("status", "OK") == "OK"),
+        key=lambda operation: abs(operation["amount"]),
+    )
+    return [
+        {
+            "date": operation["date"],
+            "amount": round(abs(operation["amount"]), 2),
+            "category": operation["category"],
+            "description": operation["description"],
+        }
+        for operation in largest
+    ]
@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Any, Dict, List
 
+from src.metrics import instrument
 
+
+@instrument("filter_by_state")
 def filter_by_state(data: List[Dict[str, Any]], state: str = "EXECUTED") -> List[Dict[str, Any]]:
     """
     Фильтрует список словарей по значению ключа 'state'.
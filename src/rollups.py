@@ -0,0 +1,52 @@
+import calendar
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable
+
+
+class ExpenseRollup:
+    """
+    Предрассчитанные суммы расходов по категориям: дневные и месячные корзины.
+
+    Строится один раз по списку транзакций и дополняется инкрементально методом add.
+    Сумма за период собирается из корзин: полные месяцы берутся из месячных корзин,
+    остальные дни — из дневных, поэтому отчет с начала месяца складывает не более 31 корзины
+    вместо просмотра всех транзакций.
+
+    Транзакция — словарь с ключами "date" (YYYY-MM-DD), "amount" (расход — отрицательная сумма) и "category".
+    """
+
+    def __init__(self, transactions: Iterable[Dict] = ()):
+        self._daily: Dict[date, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._monthly: Dict[tuple, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+        for transaction in transactions:
+            self.add(transaction)
+
+    def add(self, transaction: Dict) -> None:
+        """Учитывает одну транзакцию. Поступления (неотрицательные суммы) пропускаются."""
+        if transaction["amount"] >= 0:
+            return
+        day = date.fromisoformat(transaction["date"][:10])
+        with self._lock:
+            self._daily[day][transaction["category"]] += -transaction["amount"]
+            self._monthly[(day.year, day.month)][transaction["category"]] += -transaction["amount"]
+
+    def category_totals(self, start_date: date, end_date: date) -> Dict[str, float]:
+        """Возвращает суммы расходов по категориям за период с start_date по end_date включительно."""
+        totals: Dict[str, float] = defaultdict(float)
+        day = start_date
+        with self._lock:
+            while day <= end_date:
+                last_day = date(day.year, day.month, calendar.monthrange(day.year, day.month)[1])
+                if day.day == 1 and last_day <= end_date:
+                    bucket = self._monthly.get((day.year, day.month), {})
+                    next_day = last_day + timedelta(days=1)
+                else:
+                    bucket = self._daily.get(day, {})
+                    next_day = day + timedelta(days=1)
+                for category, amount in bucket.items():
+                    totals[category] += amount
+                day = next_day
+        return dict(totals)
@@ -1,11 +1,14 @@
 import csv
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
+
+from src.metrics import instrument
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 path = os.path.join(base_dir, "data/transactions.csv")
 
 
+@instrument("get_financial_transactions")
 def get_financial_transactions(path: str) -> List[Dict]:
     """Функция принимает путь к файлу CSV в качестве аргумента и выдает список словарей с транзакциями"""
     transactions = []
@@ -27,6 +30,48 @@ def get_financial_transactions(path: str) -> List[Dict]:
     return transactions
 
 
+@instrument("iter_financial_transactions")
+def iter_financial_transactions(path: str) -> Iterator[Dict]:
+    """Генератор, который читает CSV-файл с транзакциями построчно и выдает их по одной,
+    не загружая весь файл в память"""
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(file, delimiter=";")
+
+
+@instrument("iter_financial_transactions_from")
+def iter_financial_transactions_from(path: str, position: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """Генератор, который читает CSV-файл с транзакциями начиная с байтового смещения position
+    (0 — с первой строки данных) и выдает пары (смещение следующей строки, транзакция).
+
+    Смещение из пары позволяет продолжить чтение с того же места, не перечитывая начало файла.
+
+    Смещение за концом файла дает пустую выдачу, как и у остальных источников.
+
+    :raises ValueError: Если position не указывает на начало строки данных.
+    """
+    with open(path, mode="rb") as file:
+        fieldnames = next(csv.reader([file.readline().decode("utf-8-sig")], delimiter=";"), None)
+        if fieldnames is None:
+            return
+        if position:
+            if position >= os.fstat(file.fileno()).st_size:
+                return
+            if position < file.tell():
+                raise ValueError("Смещение за пределами данных")
+            file.seek(position - 1)
+            if file.read(1) != b"\n":
+                raise ValueError("Смещение не указывает на начало строки")
+
+        def lines():
+            while line := file.readline():
+                yield line.decode("utf-8")
+
+        # Строки читаются по одной без упреждающего чтения, поэтому после каждой записи
+        # file.tell() указывает на начало следующей
+        for row in csv.DictReader(lines(), fieldnames=fieldnames, delimiter=";"):
+            yield file.tell(), row
+
+
 if __name__ == "__main__":
     transactions = get_financial_transactions(path)
     print(transactions)
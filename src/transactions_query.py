@@ -0,0 +1,138 @@
+import base64
+import binascii
+import functools
+import json
+import os
+import re
+from datetime import datetime
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src import transactions_csv, transactions_xlsx, utils
+from src.filter_transactions import filter_by_transactions
+from src.generators import get_currency_code
+from src.processing import filter_by_state
+
+
+@functools.lru_cache(maxsize=1)
+def _load_json_source(path: str, modified_ns: int, size: int) -> List[Dict]:
+    # JSON-массив нельзя читать с произвольного места, поэтому разобранный файл хранится
+    # до его изменения (ключ кэша включает время изменения и размер)
+    return list(utils.iter_transactions(path))
+
+
+def _json_source(position: int) -> Iterator[Tuple[int, Dict]]:
+    stat = os.stat(utils.path) if os.path.exists(utils.path) else None
+    transactions = _load_json_source(utils.path, stat.st_mtime_ns, stat.st_size) if stat else []
+    return ((index + 1, transactions[index]) for index in range(position, len(transactions)))
+
+
+def _csv_source(position: int) -> Iterator[Tuple[int, Dict]]:
+    transactions = transactions_csv.iter_financial_transactions_from(transactions_csv.path, position)
+    # Первый элемент запрашивается сразу, чтобы ошибка позиции возникла до начала ответа
+    first = next(transactions, None)
+    return chain([first] if first is not None else [], transactions)
+
+
+def _xlsx_source(position: int) -> Iterator[Tuple[int, Dict]]:
+    return transactions_xlsx.iter_financial_transactions_operations_from(transactions_xlsx.path, position)
+
+
+# Источники данных: название -> функция, которая читает транзакции из файла по умолчанию начиная с позиции
+# и выдает пары (позиция для продолжения чтения, транзакция). Позиция — номер записи для JSON,
+# байтовое смещение для CSV и номер строки листа для XLSX; 0 — начало данных.
+# Позиция за концом данных дает пустую выдачу у всех источников
+SOURCES: Dict[str, Callable[[int], Iterator[Tuple[int, Dict]]]] = {
+    "json": _json_source,
+    "csv": _csv_source,
+    "xlsx": _xlsx_source,
+}
+
+CHUNK_SIZE = 1000
+
+
+def parse_date(value: Optional[str]) -> Optional[str]:
+    """Проверяет дату в формате YYYY-MM-DD и возвращает её же или None для пустого значения.
+
+    :raises ValueError: Если дата в неверном формате.
+    """
+    if not value:
+        return None
+    datetime.strptime(value, "%Y-%m-%d")
+    return value
+
+
+def encode_cursor(source: str, offset: int) -> str:
+    """Кодирует позицию в источнике данных в непрозрачную строку курсора."""
+    payload = json.dumps({"source": source, "offset": offset}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str], source: str) -> int:
+    """Возвращает позицию в источнике данных из курсора (0 для пустого курсора).
+
+    :raises ValueError: Если курсор поврежден или выдан для другого источника.
+    """
+    if not cursor:
+        return 0
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        offset = payload["offset"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValueError("Некорректный курсор")
+    if payload.get("source") != source or not isinstance(offset, int) or offset < 0:
+        raise ValueError("Некорректный курсор")
+    return offset
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def query_transactions(
+    transactions: Iterable[Dict[str, Any]],
+    state: Optional[str] = None,
+    currency: Optional[str] = None,
+    description: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    positioned: bool = False,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Лениво фильтрует транзакции и выдает пары (позиция в исходной последовательности, транзакция).
+    С positioned=True источник уже выдает пары (позиция, транзакция), как функции SOURCES,
+    и в результат попадают его позиции.
+
+    Транзакции обрабатываются порциями по chunk_size, поэтому в памяти одновременно находится
+    только одна порция независимо от размера источника.
+
+    :param transactions: Итерируемый источник транзакций в формате JSON, CSV или XLSX.
+    :param state: Статус операции, например 'EXECUTED'.
+    :param currency: Код валюты, например 'RUB'.
+    :param description: Строка для поиска в описании операции (без учета регистра).
+    :param date_from: Начальная дата включительно в формате YYYY-MM-DD.
+    :param date_to: Конечная дата включительно в формате YYYY-MM-DD.
+    :param chunk_size: Размер порции.
+    :param positioned: Источник выдает пары (позиция, транзакция).
+    """
+    search_term = re.escape(description) if description else None
+    for chunk in _chunks(transactions if positioned else enumerate(transactions), chunk_size):
+        positions = {id(transaction): position for position, transaction in chunk}
+        batch = [transaction for _, transaction in chunk if isinstance(transaction, dict)]
+        if state:
+            batch = filter_by_state(batch, state.upper())
+        if search_term:
+            batch = [transaction for transaction in batch if isinstance(transaction.get("description"), str)]
+            batch = filter_by_transactions(batch, search_term)
+
+        for transaction in batch:
+            if currency and get_currency_code(transaction) != currency.upper():
+                continue
+            if date_from or date_to:
+                day = str(transaction.get("date", ""))[:10]
+                if (date_from and day < date_from) or (date_to and day > date_to):
+                    continue
+            yield positions[id(transaction)], transaction
@@ -1,13 +1,17 @@
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 
+import openpyxl
 import pandas as pd
 
+from src.metrics import instrument
+
 # Путь к файлу
 base_dir = os.path.dirname(os.path.abspath(__file__))
 path = os.path.join(base_dir, "data/transactions_excel.xlsx")
 
 
+@instrument("get_financial_transactions_operations")
 def get_financial_transactions_operations(path: str) -> List[Dict]:
     """Функция для считывания финансовых операций из Excel принимает путь к файлу Excel в качестве аргумента
     и выдает список словарей с транзакциями"""
@@ -45,5 +49,43 @@ def get_financial_transactions_operations(path: str) -> List[Dict]:
     return operations
 
 
+@instrument("iter_financial_transactions_operations")
+def iter_financial_transactions_operations(path: str) -> Iterator[Dict]:
+    """Генератор, который читает Excel-файл с транзакциями построчно в режиме только для чтения
+    и выдает их по одной, не загружая весь лист в память"""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for row in rows:
+            if any(value is not None for value in row):
+                yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+@instrument("iter_financial_transactions_operations_from")
+def iter_financial_transactions_operations_from(path: str, position: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """Генератор, который читает Excel-файл с транзакциями после строки листа position
+    (0 — с первой строки данных) и выдает пары (номер строки листа, транзакция).
+
+    Лист XLSX — сжатый XML без произвольного доступа, поэтому пропущенные строки все равно
+    разбираются openpyxl, но словари для них не создаются."""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        sheet = workbook.active
+        header = next(sheet.iter_rows(max_row=1, values_only=True), None)
+        if header is None:
+            return
+        first_row = max(position, 1) + 1  # Первая строка листа — заголовок
+        for row_number, row in enumerate(sheet.iter_rows(min_row=first_row, values_only=True), first_row):
+            if any(value is not None for value in row):
+                yield row_number, dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
 if __name__ == "__main__":
     operations = get_financial_transactions_operations(path)
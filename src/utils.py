@@ -1,10 +1,12 @@
 import json
 import logging
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-# Создаем хэндлер
-handler = logging.FileHandler("logs.log", mode="w", encoding="utf-8")
+from src.metrics import instrument
+
+# Создаем хэндлер; путь к журналу можно переопределить переменной окружения LOG_FILE
+handler = logging.FileHandler(os.getenv("LOG_FILE", "logs.log"), mode="w", encoding="utf-8")
 formatter = logging.Formatter("%(asctime)s:%(module)s:%(levelname)s:%(name)s:%(message)s")
 handler.setFormatter(formatter)
 
@@ -17,6 +19,19 @@ base_dir = os.path.dirname(os.path.abspath(__file__))
 path = os.path.join(base_dir, "data/transactions.json")
 
 
+def is_valid_transaction(transaction) -> bool:
+    """Проверяет, что транзакция является словарем с целым id и числовой суммой в operationAmount"""
+    # Проверяем, что транзакция является словарем и содержит необходимые поля
+    if not isinstance(transaction, dict) or "id" not in transaction or "operationAmount" not in transaction:
+        return False
+    # Проверяем, что id является целым числом, а amount (из вложенного словаря) - числом
+    if not isinstance(transaction["id"], int):
+        return False
+    amount_str = transaction["operationAmount"].get("amount")
+    return isinstance(amount_str, str) and amount_str.replace(".", "", 1).isdigit()
+
+
+@instrument("load_transactions")
 def load_transactions(path: str) -> List[Dict]:
     """Функция принимает на вход путь до JSON-файла и возвращает список словарей
     с данными о финансовых транзакциях"""
@@ -44,22 +59,37 @@ def load_transactions(path: str) -> List[Dict]:
         logger.error("Загруженные данные не являются списком.")
         return []
 
-    valid_transactions = []  # Список для хранения валидных транзакций
-
-    # Проходим по всем транзакциям в загруженных данных
-    for transaction in data_operations:
-        # Проверяем, что транзакция является словарем и содержит необходимые поля
-        if isinstance(transaction, dict) and "id" in transaction and "operationAmount" in transaction:
-            # Проверяем, что id является целым числом, а amount (из вложенного словаря) - числом
-            if isinstance(transaction["id"], int):
-                amount_str = transaction["operationAmount"].get("amount")
-                if isinstance(amount_str, str) and amount_str.replace(".", "", 1).isdigit():
-                    valid_transactions.append(transaction)  # Добавляем валидную транзакцию в список
+    # Оставляем только валидные транзакции
+    valid_transactions = [transaction for transaction in data_operations if is_valid_transaction(transaction)]
 
     logger.info("Валидные транзакции загружены: %s", str(valid_transactions))
     return valid_transactions  # Возвращаем валидные транзакции
 
 
+@instrument("iter_transactions")
+def iter_transactions(path: str) -> Iterator[Dict]:
+    """Генератор, который выдает валидные транзакции из JSON-файла по одной.
+
+    Формат JSON требует разобрать массив целиком, но в отличие от load_transactions
+    генератор не строит отдельный список валидных транзакций и не пишет их в лог."""
+    if not os.path.exists(path):
+        logger.error("Файл не найден.")
+        return
+
+    with open(path, "r", encoding="utf-8") as file:
+        try:
+            data_operations = json.load(file)
+        except json.JSONDecodeError:
+            logger.error("Неподдерживаемый формат данных")
+            return
+
+    if not isinstance(data_operations, list):
+        logger.error("Загруженные данные не являются списком.")
+        return
+
+    yield from (transaction for transaction in data_operations if is_valid_transaction(transaction))
+
+
 if __name__ == "__main__":
     transactions = load_transactions(path)
     print("Полученные транзакции:", transactions)  # Выводим загруженные транзакции
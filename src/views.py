@@ -1,3 +1,6 @@
+import codecs
+import concurrent.futures
+import heapq
 import json
 import logging
 import os
@@ -5,8 +8,15 @@ from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
 import requests
 
+from src.cache import LRUCache, SQLiteCache, TieredCache
+from src.circuit_breaker import CircuitBreaker
+from src.date_index import TransactionDateIndex
+from src.metrics import instrument
+from src.rollups import ExpenseRollup
+
 # Получаем путь к файлу user_settings.json относительно текущего файла views.py
 settings_path = Path(__file__).parent.parent / "user_settings.json"
 
@@ -18,6 +28,9 @@ if not settings_path.exists():
 with open(settings_path, "r") as f:
     user_settings = json.load(f)
 
+# Таймаут запросов к внешним API, в секундах
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+
 # Пример транзакций
 transactions = [
     {"date": "2020-05-01", "amount": -17319, "category": "Супермаркеты"},
@@ -29,23 +42,76 @@ transactions = [
 ]
 
 
+# Предрассчитанные суммы расходов по дням и месяцам для generate_report
+expense_rollup = ExpenseRollup(transactions)
+
+# Транзакции, упорядоченные по дате, для выборок за период
+transactions_index = TransactionDateIndex(transactions)
+
+
+def add_transaction(transaction):
+    """Добавляет транзакцию сразу во все представления: transactions, expense_rollup и transactions_index.
+
+    Новые транзакции нужно добавлять только через эту функцию, иначе отчеты о расходах
+    и выборки за период перестанут совпадать.
+    """
+    transactions.append(transaction)
+    expense_rollup.add(transaction)
+    transactions_index.add(transaction)
+
+
 def filter_transactions(start_date, end_date):
-    """Фильтрует транзакции по заданному диапазону дат."""
-    return [t for t in transactions if start_date <= datetime.strptime(t["date"], "%Y-%m-%d") <= end_date]
+    """Фильтрует транзакции по заданному диапазону дат (двоичным поиском по индексу дат)."""
+    return transactions_index.between(start_date, end_date)
+
+
+MAIN_CATEGORIES_COUNT = 6
 
 
 def calculate_expenses(transactions):
-    """Расчет общей суммы расходов и расходов по категориям."""
-    total_expenses = -sum(t["amount"] for t in transactions if t["amount"] < 0)
-    category_totals = defaultdict(float)
+    """Расчет общей суммы расходов и расходов по категориям.
 
+    Общая сумма и суммы по категориям считаются за один проход, поэтому на вход можно
+    передавать генератор. DataFrame pandas обрабатывается векторно (calculate_expenses_vectorized).
+    """
+    if isinstance(transactions, pd.DataFrame):
+        return calculate_expenses_vectorized(transactions)
+
+    total_expenses = 0
+    category_totals = defaultdict(float)
     for t in transactions:
-        if t["amount"] < 0:
-            category_totals[t["category"]] += -t["amount"]  # Суммируем только расходы
+        amount = t["amount"]
+        if amount < 0:  # Суммируем только расходы
+            total_expenses -= amount
+            category_totals[t["category"]] -= amount
+
+    return summarize_expenses(total_expenses, category_totals)
+
+
+def calculate_expenses_vectorized(transactions):
+    """Расчет общей суммы расходов и расходов по категориям группировкой pandas.
+
+    Выгоден, когда данные уже загружены в DataFrame: построение DataFrame из списка словарей
+    обходится дороже однопроходного расчета (см. benchmarks/bench_calculate_expenses.py).
+    """
+    df = transactions if isinstance(transactions, pd.DataFrame) else pd.DataFrame(transactions)
+    expenses = df[df["amount"] < 0]
+    spent = -expenses["amount"]
+    category_totals = spent.groupby(expenses["category"], sort=False).sum()
+    total_expenses = float(spent.sum())
+    return summarize_expenses(
+        total_expenses, {category: float(amount) for category, amount in category_totals.items()}
+    )
 
-    sorted_categories = sorted(category_totals.items(), key=lambda x: x[1], reverse=True)
-    main_expenses = sorted_categories[:6]
-    other_expenses = sum(amount for category, amount in sorted_categories[6:])
+
+def summarize_expenses(total_expenses, category_totals):
+    """Формирует сводку расходов: общая сумма, 6 основных категорий и остальные одной строкой.
+
+    Основные категории выбираются частичной сортировкой (heapq.nlargest) без сортировки всех категорий.
+    """
+    main_expenses = heapq.nlargest(MAIN_CATEGORIES_COUNT, category_totals.items(), key=lambda x: x[1])
+    main_categories = {category for category, _ in main_expenses}
+    other_expenses = sum(amount for category, amount in category_totals.items() if category not in main_categories)
 
     return {
         "total_amount": total_expenses,
@@ -54,6 +120,7 @@ def calculate_expenses(transactions):
     }
 
 
+@instrument("get_currency_data")
 def get_currency_data():
     """Получает данные о валютных курсах из API."""
     url = f"{os.getenv('CURRENCY_API_URL')}/latest"
@@ -61,7 +128,7 @@ def get_currency_data():
         "apikey": os.getenv("CURRENCY_API_KEY"),
     }
 
-    response = requests.get(url, headers=headers)
+    response = requests.get(url, headers=headers, timeout=UPSTREAM_TIMEOUT)
     response.raise_for_status()  # Проверка статуса запроса
 
     return [
@@ -71,11 +138,132 @@ def get_currency_data():
     ]
 
 
-def get_stock_data(symbol):
+def _is_upstream_failure(error):
+    """Проверяет, вызвана ли ошибка сбоем сети или сервера (соединение, тайм-аут, ответ 5xx).
+
+    Ответы 4xx, например для неизвестного символа акции, сбоем не считаются: иначе клиент мог бы
+    разомкнуть предохранитель запросами несуществующих символов.
+    """
+    while error is not None:
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and error.response.status_code >= 500
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True
+        error = error.__context__
+    return False
+
+
+# Предохранители для внешних API: при серии сбоев запросы временно не выполняются
+currency_breaker = CircuitBreaker("currency", is_failure=_is_upstream_failure)
+stock_breaker = CircuitBreaker("stock", is_failure=_is_upstream_failure)
+
+# Кэш курсов валют: LRU в памяти процесса и, если задан RATES_CACHE_PATH, общий для воркеров файл SQLite
+RATES_CACHE_KEY = "currency_rates"
+RATES_CACHE_TTL = float(os.getenv("RATES_CACHE_TTL", "300"))
+rates_cache = TieredCache(
+    LRUCache(maxsize=1, ttl=RATES_CACHE_TTL),
+    SQLiteCache(os.environ["RATES_CACHE_PATH"], ttl=RATES_CACHE_TTL) if os.getenv("RATES_CACHE_PATH") else None,
+)
+
+
+def refresh_currency_data():
+    """Запрашивает актуальные курсы валют из API и сохраняет их в кэш."""
+    currency_data = get_currency_data()
+    rates_cache.set(RATES_CACHE_KEY, currency_data)
+    return currency_data
+
+
+def get_cached_currency_data():
+    """Возвращает курсы валют из кэша. Обращение к API происходит только при промахе кэша.
+
+    Если API недоступен, ошибка поднимается. Последние сохраненные (устаревшие) курсы можно
+    получить через get_stale_currency_data, пометив ответ как неполный.
+    """
+    return rates_cache.get_or_set(RATES_CACHE_KEY, lambda: currency_breaker.call(get_currency_data))
+
+
+def get_stale_currency_data():
+    """Возвращает последние сохраненные курсы валют без учета срока жизни или None."""
+    return rates_cache.get(RATES_CACHE_KEY, allow_stale=True)
+
+
+TIME_SERIES_KEY = '"Time Series (Daily)"'
+STREAM_CHUNK_SIZE = 8192
+
+
+def _decode_first_entry(buffer, position, decoder):
+    """Пытается разобрать первую пару «дата: данные» объекта временного ряда, начиная с position.
+
+    Возвращает пару (дата, данные), {} для пустого ряда или None, если данных в буфере пока недостаточно.
+    """
+    try:
+        position = _skip_whitespace(buffer, position)
+        if buffer[position] != ":":
+            raise ValueError("Некорректная структура временного ряда.")
+        position = _skip_whitespace(buffer, position + 1)
+        if buffer[position] != "{":
+            raise ValueError("Некорректная структура временного ряда.")
+        position = _skip_whitespace(buffer, position + 1)
+        if buffer[position] == "}":
+            return {}
+        latest_date, position = decoder.raw_decode(buffer, position)
+        position = _skip_whitespace(buffer, position)
+        if buffer[position] != ":":
+            raise ValueError("Некорректная структура временного ряда.")
+        position = _skip_whitespace(buffer, position + 1)
+        latest_data, _ = decoder.raw_decode(buffer, position)
+    except (IndexError, json.JSONDecodeError):
+        return None
+    return latest_date, latest_data
+
+
+def _skip_whitespace(buffer, position):
+    while buffer[position] in " \t\r\n":
+        position += 1
+    return position
+
+
+def read_latest_daily_entry(chunks):
+    """Инкрементально разбирает поток JSON-ответа TIME_SERIES_DAILY и возвращает первую запись ряда.
+
+    Чтение прекращается, как только разобрана первая дата, поэтому время и память не зависят
+    от длины истории в ответе.
+
+    Args:
+        chunks (iterable): Части ответа в виде bytes или str.
+
+    Returns:
+        tuple | None: Пара (дата, данные за день) или None, если временной ряд не найден или пуст.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    json_decoder = json.JSONDecoder()
+    buffer = ""
+    key_position = -1
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if key_position < 0:
+            key_position = buffer.find(TIME_SERIES_KEY)
+            if key_position < 0:
+                # Метаданные до ряда не нужны, храним только хвост на случай разрыва ключа между частями
+                buffer = buffer[-len(TIME_SERIES_KEY) :]
+                continue
+            buffer = buffer[key_position + len(TIME_SERIES_KEY) :]
+        entry = _decode_first_entry(buffer, 0, json_decoder)
+        if entry is not None:
+            return entry or None
+
+    return None
+
+
+@instrument("get_stock_data")
+def get_stock_data(symbol, outputsize="compact", stream=False):
     """Получает данные о ценах на акции из API по заданному символу.
 
     Args:
         symbol (str): Символ акций, например 'AAPL'.
+        outputsize (str): Размер временного ряда в ответе API: 'compact' (последние 100 дней) или 'full'.
+        stream (bool): Разбирать ответ потоково и прекращать чтение после первой (последней по времени) даты.
 
     Returns:
         list: Список словарей с символом и последней ценой.
@@ -90,10 +278,10 @@ def get_stock_data(symbol):
     if not api_key or not api_url:
         raise EnvironmentError("Не заданы переменные окружения для API.")
 
-    url = f"{api_url}query?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={api_key}"
+    url = f"{api_url}query?function=TIME_SERIES_DAILY&symbol={symbol}&outputsize={outputsize}&apikey={api_key}"
 
     try:
-        response = requests.get(url)
+        response = requests.get(url, stream=stream, timeout=UPSTREAM_TIMEOUT)
         response.raise_for_status()  # Поднимает исключение для статусов ошибок (4xx и 5xx)
 
         logging.info(f"HTTP Status Code: {response.status_code}")
@@ -103,6 +291,15 @@ def get_stock_data(symbol):
         if response.headers.get("Content-Type") != "application/json":
             raise ValueError("Получена некорректная страница вместо JSON. Проверьте API URL и ключ.")
 
+        if stream:
+            try:
+                latest_entry = read_latest_daily_entry(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            finally:
+                response.close()  # Остаток ответа не дочитываем
+            if not latest_entry:
+                raise ValueError("Данные акций не найдены.")
+            return [{"stock": symbol, "price": float(latest_entry[1]["4. close"])}]
+
         stock_data = response.json().get("Time Series (Daily)", {})
         if not stock_data:  # Если нет данных о акциях
             raise ValueError("Данные акций не найдены.")
@@ -127,20 +324,137 @@ def get_stock_data(symbol):
         raise ValueError(f"Ошибка парсинга JSON: {str(val_err)}")
 
 
-def generate_report(date_str, stock_symbol):
-    """Генерирует отчет на основе входной даты."""
-    current_date = datetime.strptime(date_str, "%Y-%m-%d")
-    start_date = current_date.replace(day=1)
-    end_date = current_date
+# Кэш котировок акций по символу
+STOCK_CACHE_TTL = float(os.getenv("STOCK_CACHE_TTL", "60"))
+stock_cache = LRUCache(maxsize=256, ttl=STOCK_CACHE_TTL)
+
+
+def get_cached_stock_data(symbol):
+    """Возвращает котировку акции из кэша, при промахе запрашивает её через get_stock_data.
+
+    Если API недоступен, ошибка поднимается. Последнюю сохраненную (устаревшую) котировку можно
+    получить через get_stale_stock_data, пометив ответ как неполный.
+    """
+    stock_data = stock_cache.get(symbol)
+    if stock_data is None:
+        stock_data = stock_breaker.call(get_stock_data, symbol)
+        stock_cache.set(symbol, stock_data)
+    return stock_data
+
+
+def get_stale_stock_data(symbol):
+    """Возвращает последнюю сохраненную котировку акции без учета срока жизни или None."""
+    return stock_cache.get(symbol, allow_stale=True)
+
+
+def get_stocks_data(symbols, max_workers=8, executor=None):
+    """Получает котировки нескольких акций параллельно.
+
+    Повторяющиеся символы запрашиваются один раз. Ошибка по одному символу не прерывает
+    обработку остальных и попадает в словарь ошибок; если для символа есть устаревшая котировка
+    в кэше, она возвращается в результатах.
+
+    Args:
+        symbols (list): Символы акций, например ['AAPL', 'MSFT'].
+        max_workers (int): Максимальное количество одновременных запросов, если executor не передан.
+        executor: Долгоживущий пул задач (например, WorkerExecutor приложения). Если не передан,
+            создается временный пул на время вызова.
+
+    Returns:
+        tuple: Словарь котировок по символам и словарь сообщений об ошибках по символам.
+    """
+    unique_symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    results, errors = {}, {}
+    if not unique_symbols:
+        return results, errors
+
+    if executor is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_symbols))) as executor:
+            return get_stocks_data(unique_symbols, executor=executor)
+
+    future_to_symbol = {}
+    for symbol in unique_symbols:
+        try:
+            future_to_symbol[executor.submit(get_cached_stock_data, symbol)] = symbol
+        except RuntimeError as e:  # Пул перегружен или остановлен
+            errors[symbol] = str(e)
+
+    for future in concurrent.futures.as_completed(future_to_symbol):
+        symbol = future_to_symbol[future]
+        try:
+            results[symbol] = future.result()
+        except Exception as e:
+            logging.error("Error fetching stock price for %s: %s", symbol, e)
+            errors[symbol] = str(e)
+            stale_data = get_stale_stock_data(symbol)
+            if stale_data is not None:
+                results[symbol] = stale_data
+
+    return results, errors
+
 
-    filtered_transactions = filter_transactions(start_date, end_date)
+def generate_report(date_str, stock_symbol):
+    """Генерирует отчет на основе входной даты.
 
-    expenses = calculate_expenses(filtered_transactions)
+    Котировка запрашивается напрямую через get_stock_data, без кэша; ошибка получения данных
+    поднимается, а не сохраняется в отчете, как в generate_reports.
+    """
+    current_date = datetime.strptime(date_str, "%Y-%m-%d").date()
 
     response_data = {
-        "expenses": expenses,
+        "expenses": month_to_date_expenses(current_date),
         "currency_rates": get_currency_data(),
         "stock_prices": get_stock_data(stock_symbol),  # Передаем символ акций
     }
 
     return response_data
+
+
+def month_to_date_expenses(current_date):
+    """Сводка расходов с первого числа месяца по current_date включительно.
+
+    Суммы собираются из дневных корзин expense_rollup (не более 31), без просмотра всех транзакций.
+    """
+    category_totals = expense_rollup.category_totals(current_date.replace(day=1), current_date)
+    return summarize_expenses(sum(category_totals.values()), category_totals)
+
+
+def generate_reports(report_requests, executor=None):
+    """Генерирует отчеты для набора пар (дата, символ акции).
+
+    Расходы каждой различной даты собираются один раз из предрассчитанных корзин expense_rollup;
+    все отчеты используют один запрос курсов валют и один запрос котировки на каждый различный символ.
+
+    Args:
+        report_requests (list): Пары (date_str, stock_symbol), дата в формате YYYY-MM-DD.
+        executor: Пул задач для параллельного запроса котировок (см. get_stocks_data).
+
+    Returns:
+        list: Отчеты в порядке запросов. Если котировку получить не удалось, stock_prices пуст,
+            а сообщение об ошибке сохраняется в поле errors.
+    """
+    report_requests = [
+        (datetime.strptime(date_str, "%Y-%m-%d").date(), stock_symbol) for date_str, stock_symbol in report_requests
+    ]
+    if not report_requests:
+        return []
+
+    expenses = {current_date: month_to_date_expenses(current_date) for current_date in {d for d, _ in report_requests}}
+
+    currency_rates = get_currency_data()
+    stock_prices, stock_errors = get_stocks_data(
+        [stock_symbol for _, stock_symbol in report_requests], executor=executor
+    )
+
+    reports = []
+    for current_date, stock_symbol in report_requests:
+        symbol = stock_symbol.strip().upper()
+        report = {
+            "expenses": expenses[current_date],
+            "currency_rates": currency_rates,
+            "stock_prices": stock_prices.get(symbol, []),
+        }
+        if symbol in stock_errors:
+            report["errors"] = {symbol: stock_errors[symbol]}
+        reports.append(report)
+    return reports
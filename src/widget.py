@@ -1,3 +1,7 @@
+import functools
+from typing import Dict, Iterable, List, Tuple, Union
+
+
 def mask_account_card(card_details: str) -> str:
     """Принимает строку с типом карты/счета и номером, возвращает замаскированный номер."""
     if not card_details:
@@ -31,6 +35,21 @@ def mask_account_card(card_details: str) -> str:
 print(mask_account_card("Visa Platinum 7000792289606361"))
 
 
+# Достаточно, чтобы вместить все дни за сотню лет
+DATE_CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _format_date_part(date_part: str) -> str:
+    """Форматирует часть даты YYYY-MM-DD в DD.MM.YYYY. Результат кэшируется: у многих операций общий день."""
+    parts = date_part.split("-")
+
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        raise ValueError("Invalid date format")
+
+    return f"{parts[2]}.{parts[1]}.{parts[0]}"
+
+
 def get_data(date: str) -> str:
     """Заменяем знак "-" в строке с датой на "." и форматируем дату."""
     if not date:
@@ -39,14 +58,24 @@ def get_data(date: str) -> str:
     if "T" not in date:
         raise ValueError("Incomplete date format")
 
-    date_part = date.split("T")[0]  # берем только часть до T
-    parts = date_part.split("-")
+    return _format_date_part(date.partition("T")[0])  # берем только часть до T
 
-    if len(parts) != 3 or not all(part.isdigit() for part in parts):
-        raise ValueError("Invalid date format")
 
-    formatted_date = f"{parts[2]}.{parts[1]}.{parts[0]}"
-    return formatted_date
+def get_data_batch(dates: Iterable[str]) -> Tuple[List[Union[str, None]], Dict[int, str]]:
+    """
+    Форматирует набор дат так же, как get_data, и не прерывается на ошибочных значениях.
+
+    Возвращает список отформатированных дат (None на месте ошибочных) и словарь
+    {индекс: сообщение об ошибке} с теми же сообщениями, что у get_data.
+    """
+    results, errors = [], {}
+    for index, date in enumerate(dates):
+        try:
+            results.append(get_data(date))
+        except (ValueError, TypeError) as e:
+            results.append(None)
+            errors[index] = str(e)
+    return results, errors
 
 
 print(get_data("2024-03-11T02:26:18.671407"))
@@ -0,0 +1,10 @@
+"""
+Точка входа WSGI для запуска приложения в продакшн-режиме с несколькими процессами-воркерами.
+
+Пример запуска (настройки воркеров и корректного завершения — в gunicorn.conf.py):
+    gunicorn -c gunicorn.conf.py src.wsgi:app
+"""
+
+from src.app import app
+
+__all__ = ["app"]
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# Модули приложения при импорте открывают журнал logs.log; в тестах он пишется во временный каталог
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.mkdtemp(prefix="tests-logs-"), "logs.log"))
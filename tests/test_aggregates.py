@@ -0,0 +1,42 @@
+import pytest
+
+from src.aggregates import CardAggregates
+
+
+@pytest.fixture
+def aggregates():
+    return CardAggregates(
+        [
+            {"date": "2021-12-01", "card_number": "*7197", "status": "OK", "amount": -100.0},
+            {"date": "2021-12-15", "card_number": "*7197", "status": "OK", "amount": -250.5},
+            {"date": "2021-12-15", "card_number": "*7197", "status": "FAILED", "amount": -1000.0},
+            {"date": "2021-12-20", "card_number": "*5091", "status": "OK", "amount": -1198.23},
+            {"date": "2021-12-21", "card_number": "*5091", "status": "OK", "amount": 500.0},  # Пополнение
+        ]
+    )
+
+
+def test_card_totals(aggregates):
+    assert aggregates.card("7197") == {"last_digits": "7197", "total_spent": 350.5, "cashback": 3.5, "count": 2}
+
+
+def test_card_period(aggregates):
+    assert aggregates.card("7197", start="2021-12-02", end="2021-12-31")["total_spent"] == 250.5
+    assert aggregates.card("7197", end="2021-12-01")["count"] == 1
+    assert aggregates.card("7197", start="2022-01-01")["total_spent"] == 0
+
+
+def test_incremental_update(aggregates):
+    aggregates.add({"date": "2021-12-10", "card_number": "*7197", "status": "OK", "amount": -49.5})
+
+    assert aggregates.card("7197")["total_spent"] == 400.0
+    assert aggregates.card("7197", start="2021-12-05", end="2021-12-10")["count"] == 1
+
+
+def test_summary(aggregates):
+    assert [card["last_digits"] for card in aggregates.summary()] == ["7197", "5091"]
+    assert aggregates.summary(start="2021-12-16")[0]["total_spent"] == 0
+
+
+def test_unknown_card(aggregates):
+    assert aggregates.card("0000") == {"last_digits": "0000", "total_spent": 0.0, "cashback": 0.0, "count": 0}
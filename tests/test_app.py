@@ -1,8 +1,17 @@
+import json
 import logging
+import threading
+import time
 import unittest
 from unittest import mock
 
-from src.app import app
+from src import app as app_module
+from src.aggregates import CardAggregates
+from src.app import app, get_top_transactions, ingest_operations
+from src.http_cache import response_cache
+from src.operations import top_transactions
+from src.transactions_query import encode_cursor
+from src.views import rates_cache, stock_cache
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -18,6 +27,7 @@ class FinancialApiTestCase(unittest.TestCase):
     def setUp(self):
         """Вызывается перед каждым тестом, можно использовать для настройки."""
         # Это может включать дополнительные настройки, если необходимо
+        response_cache.clear()
 
     def test_home(self):
         response = self.app.get("/")
@@ -52,6 +62,31 @@ class FinancialApiTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.json, {"error": "Stock not found"})
 
+    @mock.patch("src.views.get_stock_data")
+    def test_get_stocks_batch(self, mock_get_stock_data):
+        stock_cache.clear()
+
+        def fake_stock_data(symbol):
+            if symbol == "INVALID":
+                raise ValueError("Акции не найдены.")
+            return [{"stock": symbol, "price": 100.0}]
+
+        mock_get_stock_data.side_effect = fake_stock_data
+
+        response = self.app.get("/stocks?symbols=aapl,MSFT,AAPL,INVALID")
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["stocks"]["AAPL"], [{"stock": "AAPL", "price": 100.0}])
+        self.assertEqual(data["stocks"]["MSFT"], [{"stock": "MSFT", "price": 100.0}])
+        self.assertEqual(data["errors"], {"INVALID": "Акции не найдены."})
+        self.assertEqual(mock_get_stock_data.call_count, 3)  # Дубликат AAPL не запрашивается повторно
+        stock_cache.clear()
+
+    def test_get_stocks_missing_symbols(self):
+        response = self.app.get("/stocks")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {"error": "Parameter 'symbols' is required"})
+
     @mock.patch("src.views.get_currency_data")
     @mock.patch("src.views.get_stock_data")
     def test_get_data_success(self, mock_get_stock_data, mock_get_currency_data):
@@ -67,6 +102,199 @@ class FinancialApiTestCase(unittest.TestCase):
         self.assertIn("currency_rates", data)
         self.assertIn("stock_prices", data)
 
+    @mock.patch("src.app.API_DATA_DEADLINE", 0.2)
+    @mock.patch("src.views.get_currency_data")
+    @mock.patch("src.views.get_stock_data")
+    def test_get_data_deadline(self, mock_get_stock_data, mock_get_currency_data):
+        rates_cache.clear()
+        stock_cache.clear()
+        release = threading.Event()
+        mock_get_currency_data.side_effect = lambda: release.wait(5) or []  # Зависший API валют
+        mock_get_stock_data.side_effect = lambda symbol: [{"stock": symbol, "price": 150.0}]
+
+        started = time.monotonic()
+        response = self.app.get("/api/data?date_time=2023-10-01 12:00:00")
+        release.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["currency_rates"], [])
+        self.assertIn("currency_rates", data["errors"])
+        self.assertIn([{"stock": "AAPL", "price": 150.0}], data["stock_prices"])
+        stock_cache.clear()
+
+    @mock.patch("src.views.get_currency_data")
+    @mock.patch("src.views.get_stock_data")
+    def test_get_data_stock_failure_not_cached(self, mock_get_stock_data, mock_get_currency_data):
+        rates_cache.clear()
+        stock_cache.clear()
+        mock_get_currency_data.return_value = [{"currency": "EUR", "rate": 1}]
+
+        def failing_stock_data(symbol):
+            if symbol == "AAPL":
+                raise ValueError("boom")
+            return [{"stock": symbol, "price": 150.0}]
+
+        mock_get_stock_data.side_effect = failing_stock_data
+        first = self.app.get("/api/data?date_time=2023-10-01 12:00:00")
+        self.assertEqual(first.get_json()["errors"], {"stock_prices": {"AAPL": "boom"}})
+        self.assertNotIn("max-age", first.headers.get("Cache-Control", ""))
+
+        # API восстановился: второй запрос должен дойти до него, а не получить ответ из кэша
+        mock_get_stock_data.side_effect = lambda symbol: [{"stock": symbol, "price": 150.0}]
+        second = self.app.get("/api/data?date_time=2023-10-01 12:00:00")
+        data = second.get_json()
+        self.assertNotIn("errors", data)
+        self.assertIn([{"stock": "AAPL", "price": 150.0}], data["stock_prices"])
+        stock_cache.clear()
+
+    @mock.patch("src.app.get_cached_currency_data")
+    def test_currency_conditional_get(self, mock_get_cached_currency_data):
+        mock_get_cached_currency_data.return_value = [{"currency": "EUR", "rate": 1}]
+
+        first = self.app.get("/currency")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+
+        second = self.app.get("/currency", headers={"If-None-Match": etag})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b"")
+
+        third = self.app.get("/currency")
+        self.assertEqual(third.get_json(), [{"currency": "EUR", "rate": 1}])
+        self.assertEqual(third.headers["ETag"], etag)
+        mock_get_cached_currency_data.assert_called_once()  # Повторные запросы обслужены из кэша ответов
+
+    @mock.patch("src.views.get_currency_data")
+    def test_currency_stale_not_cached(self, mock_get_currency_data):
+        rates_cache.clear()
+        rates_cache.local.set("currency_rates", [{"currency": "EUR", "rate": 1}], ttl=-1)  # Запись уже устарела
+        mock_get_currency_data.side_effect = ValueError("timeout")
+
+        response = self.app.get("/currency")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [{"currency": "EUR", "rate": 1}])
+        self.assertIn("no-store", response.headers["Cache-Control"])
+        self.assertIn("Stale", response.headers["Warning"])
+        self.assertNotIn("ETag", response.headers)
+        rates_cache.clear()
+
+    @mock.patch("src.views.get_currency_data")
+    @mock.patch("src.views.get_stock_data")
+    def test_get_data_stale_quote_reported(self, mock_get_stock_data, mock_get_currency_data):
+        rates_cache.clear()
+        stock_cache.clear()
+        stock_cache.set("AAPL", [{"stock": "AAPL", "price": 140.0}], ttl=-1)  # Запись уже устарела
+        mock_get_currency_data.return_value = [{"currency": "EUR", "rate": 1}]
+
+        def failing_stock_data(symbol):
+            if symbol == "AAPL":
+                raise ValueError("boom")
+            return [{"stock": symbol, "price": 150.0}]
+
+        mock_get_stock_data.side_effect = failing_stock_data
+        response = self.app.get("/api/data?date_time=2023-10-01 12:00:00")
+        data = response.get_json()
+        self.assertIn([{"stock": "AAPL", "price": 140.0}], data["stock_prices"])
+        self.assertEqual(data["errors"], {"stock_prices": {"AAPL": "boom"}})
+        self.assertIn("no-store", response.headers["Cache-Control"])
+        rates_cache.clear()
+        stock_cache.clear()
+
+    @mock.patch("src.app.get_stocks_data")
+    def test_partial_response_not_cached(self, mock_get_stocks_data):
+        mock_get_stocks_data.return_value = ({}, {"AAPL": "timeout"})
+
+        self.app.get("/stocks?symbols=AAPL")
+        response = self.app.get("/stocks?symbols=AAPL")
+        self.assertNotIn("ETag", response.headers)
+        self.assertEqual(mock_get_stocks_data.call_count, 2)
+
+    def test_transactions_pagination(self):
+        first_page = self.app.get("/transactions?source=csv&state=EXECUTED&currency=RUB&limit=2").get_json()
+        self.assertEqual(len(first_page["transactions"]), 2)
+        self.assertIsNotNone(first_page["next_cursor"])
+
+        second_page = self.app.get(
+            f"/transactions?source=csv&state=EXECUTED&currency=RUB&limit=2&cursor={first_page['next_cursor']}"
+        ).get_json()
+        both_pages = self.app.get("/transactions?source=csv&state=EXECUTED&currency=RUB&limit=4").get_json()
+        self.assertEqual(first_page["transactions"] + second_page["transactions"], both_pages["transactions"])
+
+    def test_transactions_pagination_all_sources(self):
+        for source in ("json", "csv", "xlsx"):
+            with self.subTest(source=source):
+                everything = self.app.get(f"/transactions?source={source}&limit=1000").get_json()["transactions"]
+                paged, cursor = [], None
+                while True:
+                    url = f"/transactions?source={source}&limit=97" + (f"&cursor={cursor}" if cursor else "")
+                    page = self.app.get(url).get_json()
+                    paged += page["transactions"]
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+                self.assertEqual(paged, everything)
+
+    def test_transactions_cursor_past_end_all_sources(self):
+        for source in ("json", "csv", "xlsx"):
+            with self.subTest(source=source):
+                response = self.app.get(f"/transactions?source={source}&cursor={encode_cursor(source, 10**9)}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.get_json()["transactions"], [])
+                self.assertIsNone(response.get_json()["next_cursor"])
+
+    def test_transactions_ndjson(self):
+        response = self.app.get("/transactions?source=json&state=EXECUTED&format=ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.data.decode("utf-8").splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(json.loads(line)["state"] == "EXECUTED" for line in lines))
+
+    def test_transactions_invalid_params(self):
+        self.assertEqual(self.app.get("/transactions?source=txt").status_code, 400)
+        self.assertEqual(self.app.get("/transactions?limit=0").status_code, 400)
+        self.assertEqual(self.app.get("/transactions?date_from=01.05.2020").status_code, 400)
+        self.assertEqual(self.app.get("/transactions?cursor=broken").status_code, 400)
+        # Курсор CSV с байтовым смещением посередине строки
+        self.assertEqual(self.app.get(f"/transactions?source=csv&cursor={encode_cursor('csv', 75)}").status_code, 400)
+
+    @mock.patch(
+        "src.app.transactions",
+        [
+            {"date": "2021-12-21", "amount": 100.0, "category": "Переводы", "description": "Перевод"},
+            {"date": "2021-12-20", "amount": -900.004, "category": "Супермаркеты", "description": "Лента"},
+        ],
+    )
+    def test_sample_top_transactions_rank_by_absolute_amount(self):
+        operations = [{**transaction, "card_number": "", "status": "OK"} for transaction in app_module.transactions]
+        self.assertEqual([t["amount"] for t in get_top_transactions()], [900.0, 100.0])
+        # Примеры данных и выгрузка операций дают один формат топа транзакций
+        self.assertEqual(get_top_transactions(), top_transactions(operations))
+
+    @mock.patch("src.app.card_aggregates", CardAggregates())
+    @mock.patch("src.app.dashboard_top_transactions", [])
+    @mock.patch("src.views.get_currency_data")
+    @mock.patch("src.views.get_stock_data")
+    def test_ingest_operations(self, mock_get_stock_data, mock_get_currency_data):
+        mock_get_currency_data.return_value = []
+        mock_get_stock_data.side_effect = lambda symbol: [{"stock": symbol, "price": 150.0}]
+        operation = {
+            "date": "2021-12-31",
+            "card_number": "*7197",
+            "status": "OK",
+            "amount": -160.89,
+            "category": "Супермаркеты",
+            "description": "Колхоз",
+        }
+
+        ingest_operations([operation])
+
+        data = self.app.get("/api/data?date_time=2023-10-01 12:00:00").get_json()
+        self.assertEqual(data["cards"], [{"last_digits": "7197", "total_spent": 160.89, "cashback": 1.61, "count": 1}])
+        self.assertEqual(data["top_transactions"][0]["amount"], 160.89)
+
     def test_get_data_missing_date_time(self):
         response = self.app.get("/api/data")
         self.assertEqual(response.status_code, 400)
@@ -77,6 +305,21 @@ class FinancialApiTestCase(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json, {"error": "Invalid date format. Use 'YYYY-MM-DD HH:MM:SS'"})
 
+    @mock.patch("src.views.requests.get")
+    def test_metrics(self, mock_get):
+        mock_get.return_value.json.return_value = {"rates": {"USD": 74.21}}
+        rates_cache.clear()
+        self.app.get("/currency")
+
+        response = self.app.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        body = response.data.decode("utf-8")
+        self.assertIn('http_requests_total{method="GET",route="/currency",status="200"}', body)
+        self.assertIn('stage_calls_total{stage="get_currency_data",status="ok"}', body)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/currency"}', body)
+        rates_cache.clear()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,25 @@
+import json
+import os
+
+from benchmarks.bench_processing import compare
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "baseline.json"
+)
+
+
+def test_compare_with_stored_baseline():
+    with open(BASELINE_PATH, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    assert "filter_by_currency[100000]" in baseline
+    assert compare(baseline, baseline, threshold=0.2) == []
+
+    slower = dict(baseline)
+    slower["filter_by_currency[100000]"] = {
+        "seconds": baseline["filter_by_currency[100000]"]["seconds"] * 1.5,
+        "peak_bytes": baseline["filter_by_currency[100000]"]["peak_bytes"],
+    }
+    regressions = compare(slower, baseline, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("filter_by_currency[100000] seconds:")
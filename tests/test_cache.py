@@ -0,0 +1,100 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.cache import LRUCache, PeriodicRefresher, SQLiteCache, TieredCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "a" становится самым свежим
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(maxsize=2, ttl=10)
+    with patch("src.cache.time.monotonic", return_value=100):
+        cache.set("a", 1)
+    with patch("src.cache.time.monotonic", return_value=105):
+        assert cache.get("a") == 1
+    with patch("src.cache.time.monotonic", return_value=111):
+        assert cache.get("a", "нет") == "нет"
+
+
+def test_lru_cache_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_sqlite_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / "rates.db")
+    SQLiteCache(path).set("rates", [{"currency": "USD", "rate": 74.21}])
+
+    assert SQLiteCache(path).get("rates") == [{"currency": "USD", "rate": 74.21}]
+
+
+def test_sqlite_cache_expires_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "rates.db"), ttl=10)
+    with patch("src.cache.time.time", return_value=100):
+        cache.set("rates", [1, 2])
+    with patch("src.cache.time.time", return_value=111):
+        assert cache.get("rates") is None
+
+
+def test_tiered_cache_promotes_shared_value(tmp_path):
+    shared = SQLiteCache(str(tmp_path / "rates.db"))
+    shared.set("rates", {"USD": 74.21})
+    cache = TieredCache(LRUCache(maxsize=1), shared)
+
+    assert cache.get("rates") == {"USD": 74.21}
+    assert cache.local.get("rates") == {"USD": 74.21}
+
+
+def test_tiered_cache_promotes_with_remaining_ttl(tmp_path):
+    shared = SQLiteCache(str(tmp_path / "rates.db"), ttl=60)
+    with patch("src.cache.time.time", return_value=100):
+        shared.set("rates", {"USD": 74.21})
+    cache = TieredCache(LRUCache(maxsize=1, ttl=60), shared)
+
+    # В общем уровне записи осталось 5 секунд — в памяти она должна устареть тогда же, а не через 60
+    with patch("src.cache.time.time", return_value=155), patch("src.cache.time.monotonic", return_value=1000):
+        assert cache.get("rates") == {"USD": 74.21}
+    with patch("src.cache.time.monotonic", return_value=1006):
+        assert cache.local.get("rates") is None
+
+
+def test_tiered_cache_get_or_set_calls_factory_once():
+    cache = TieredCache(LRUCache(maxsize=1))
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return [{"currency": "EUR", "rate": 88.47}]
+
+    assert cache.get_or_set("rates", factory) == [{"currency": "EUR", "rate": 88.47}]
+    assert cache.get_or_set("rates", factory) == [{"currency": "EUR", "rate": 88.47}]
+    assert len(calls) == 1
+
+
+def test_periodic_refresher_reports_errors():
+    called = threading.Event()
+    errors = []
+
+    def failing():
+        called.set()
+        raise RuntimeError("API недоступен")
+
+    refresher = PeriodicRefresher(failing, interval=60, on_error=errors.append)
+    refresher.start()
+    assert called.wait(1)
+    refresher.stop(timeout=1)
+
+    assert isinstance(errors[0], RuntimeError)
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def failing():
+    raise ConnectionError("Сервис не отвечает")
+
+
+def test_circuit_opens_after_threshold():
+    breaker = CircuitBreaker("stock", failure_threshold=2, reset_timeout=30)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "не должно вызываться")
+
+
+def test_circuit_half_open_trial_closes_on_success():
+    breaker = CircuitBreaker("stock", failure_threshold=1, reset_timeout=30)
+    with patch("src.circuit_breaker.time.monotonic", return_value=100):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+    with patch("src.circuit_breaker.time.monotonic", return_value=131):
+        assert breaker.call(lambda: 42) == 42
+
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_circuit_half_open_trial_reopens_on_failure():
+    breaker = CircuitBreaker("stock", failure_threshold=1, reset_timeout=30)
+    with patch("src.circuit_breaker.time.monotonic", return_value=100):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+    with patch("src.circuit_breaker.time.monotonic", return_value=131):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+    assert breaker.state == OPEN
+
+
+def test_circuit_half_open_allows_single_trial():
+    breaker = CircuitBreaker("stock")
+    breaker.state = HALF_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "пробный вызов уже выполняется")
+
+
+def test_circuit_ignores_non_failures():
+    breaker = CircuitBreaker("stock", failure_threshold=1, is_failure=lambda e: isinstance(e, ConnectionError))
+
+    with pytest.raises(ValueError):
+        breaker.call(int, "не число")
+
+    assert breaker.state == CLOSED
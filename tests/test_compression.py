@@ -0,0 +1,62 @@
+import gzip
+
+import pytest
+from flask import Flask, jsonify
+
+from src.compression import compressed_cache, init_compression
+from src.http_cache import cached_response, response_cache
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    init_compression(app, min_size=100)
+
+    @app.route("/big")
+    def big():
+        return jsonify([{"description": "Перевод организации", "amount": index} for index in range(100)])
+
+    @app.route("/small")
+    def small():
+        return jsonify({"status": "ok"})
+
+    @app.route("/cached")
+    @cached_response(ttl=60)
+    def cached():
+        return jsonify(["Перевод со счета на счет"] * 50)
+
+    response_cache.clear()
+    compressed_cache.clear()
+    return app.test_client()
+
+
+def test_large_response_is_gzipped(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    data = gzip.decompress(response.data)
+    assert data.decode("utf-8").startswith('[{"amount":0')
+
+
+def test_small_response_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == {"status": "ok"}
+
+
+def test_no_compression_without_accept_encoding(client):
+    response = client.get("/big")
+
+    assert "Content-Encoding" not in response.headers
+    assert len(response.get_json()) == 100
+
+
+def test_compressed_cached_response_keeps_conditional_get(client):
+    first = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.headers["ETag"].startswith('W/"')
+
+    second = client.get("/cached", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
@@ -0,0 +1,55 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.date_index import TransactionDateIndex
+
+
+@pytest.fixture
+def index():
+    return TransactionDateIndex(
+        [
+            {"date": "2020-05-03", "amount": -2289, "category": "Топливо"},
+            {"date": "2020-05-01", "amount": -17319, "category": "Супермаркеты"},
+            {"date": "2020-05-02", "amount": -3324, "category": "Фастфуд"},
+            {"date": "2020-05-02", "amount": -100, "category": "Фастфуд"},
+            {"date": "2020-06-01", "amount": 33000, "category": "Пополнение_BANK007"},
+        ]
+    )
+
+
+def test_between_returns_sorted_slice(index):
+    result = index.between(datetime(2020, 5, 2), datetime(2020, 5, 3))
+    assert [t["amount"] for t in result] == [-3324, -100, -2289]
+
+
+def test_between_accepts_dates(index):
+    assert len(index.between(date(2020, 5, 1), date(2020, 5, 31))) == 4
+
+
+def test_between_empty_range(index):
+    assert index.between(datetime(2019, 1, 1), datetime(2019, 12, 31)) == []
+
+
+def test_add_keeps_order(index):
+    index.add({"date": "2020-05-15", "amount": 1242, "category": "Проценты_на_остаток"})
+    result = index.between(date(2020, 5, 10), date(2020, 12, 31))
+    assert [t["date"] for t in result] == ["2020-05-15", "2020-06-01"]
+    assert len(index) == 6
+
+
+@pytest.mark.parametrize("batch_size", [1, 200])  # Поштучная вставка и пересборка индекса
+def test_add_many_matches_single_adds(index, batch_size):
+    batch = [
+        {"date": f"2020-{month:02d}-{day:02d}T12:00:00", "amount": -month * day, "category": "Прочее"}
+        for month, day in [(5, 2), (4, 30), (7, 1), (5, 2)] * batch_size
+    ]
+    expected = TransactionDateIndex(index.between(date(2000, 1, 1), date(2100, 1, 1)))
+    for transaction in batch:
+        expected.add(transaction)
+
+    index.add_many(batch)
+
+    everything = (date(2000, 1, 1), date(2100, 1, 1))
+    assert index.between(*everything) == expected.between(*everything)
+    assert len(index) == 5 + len(batch)
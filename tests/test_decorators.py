@@ -1,23 +1,27 @@
+import asyncio
 import os
+import threading
+import time
+from unittest import mock
 
 import pytest
 
-from src.decorators import log
+from src import decorators
+from src.decorators import dropped_log_records, dump_timings, flush_logs, log, reset_timings, timing_summary
 
 
-# Удаление файла журнала после выполнения теста
+# Журнал пишется во временный каталог теста, а не в корень репозитория
 @pytest.fixture
-def clean_up():
-    """Фикстура для удаления файла журнала после выполнения тестов.
+def clean_up(tmp_path, monkeypatch):
+    """Фикстура переводит тест во временный каталог tmp_path.
 
-    Эта фикстура используется для обеспечения чистоты перед тестами.
-    Перед выполнением теста ничего не делает, но после выполнения
-    теста проверяет, существует ли файл `test_log.txt` и
-    удаляет его, если он существует.
+    Декорированные функции пишут журнал по относительному пути `test_log.txt`,
+    поэтому файл создается в tmp_path и удаляется вместе с ним. После теста
+    буферизованные записи сбрасываются до возврата в исходный каталог.
     """
+    monkeypatch.chdir(tmp_path)
     yield
-    if os.path.exists("test_log.txt"):
-        os.remove("test_log.txt")
+    flush_logs()
 
 
 @log("test_log.txt")
@@ -71,3 +75,192 @@ def test_log_error(clean_up):
         logs = file.readlines()
 
     assert any("Ошибка в функции: divide с аргументами: (10, 0), {}" in log for log in logs)
+
+
+@log("test_log.txt", buffered=True, flush_interval=0.05)
+def multiply(x, y):
+    return x * y
+
+
+def test_buffered_log_written_after_flush(clean_up):
+    """Тестирует запись буферизованного журнала фоновым потоком после flush_logs."""
+    for i in range(100):
+        multiply(i, 2)
+    with pytest.raises(TypeError):
+        multiply(None, 2)
+    flush_logs()
+
+    with open("test_log.txt", "r") as file:
+        logs = file.readlines()
+
+    assert "Функция: multiply вернула: 198\n" in logs
+    assert any("Ошибка в функции: multiply с аргументами: (None, 2), {}" in log for log in logs)
+    assert len(logs) == 201
+
+
+def test_buffered_log_flushed_by_interval(clean_up):
+    """Тестирует автоматическую запись журнала по истечении интервала сброса."""
+    multiply(3, 4)
+    # Ждем саму запись, не вызывая flush_logs: файл может появиться раньше, чем в него что-то записано
+    deadline = time.monotonic() + 2
+    logs = []
+    while time.monotonic() < deadline and "Функция: multiply вернула: 12\n" not in logs:
+        time.sleep(0.01)
+        if os.path.exists("test_log.txt"):
+            with open("test_log.txt", "r") as file:
+                logs = file.readlines()
+
+    assert "Функция: multiply вернула: 12\n" in logs
+
+
+def test_buffered_log_open_error_raised_in_caller(tmp_path):
+    """Тестирует, что ошибка открытия файла журнала поднимается в вызове, а flush_logs не зависает."""
+
+    @log(str(tmp_path / "missing_dir" / "log.txt"), buffered=True)
+    def add(x, y):
+        return x + y
+
+    with pytest.raises(FileNotFoundError):
+        add(1, 2)
+    started = time.monotonic()
+    flush_logs()
+    assert time.monotonic() - started < 1
+
+
+def test_buffered_log_recovers_after_write_error(tmp_path, monkeypatch):
+    """Тестирует остановку фонового потока при ошибке записи: записи не теряются, flush_logs не зависает."""
+    filename = str(tmp_path / "log.txt")
+
+    @log(filename, buffered=True, flush_interval=0.01)
+    def add(x, y):
+        return x + y
+
+    add(1, 2)
+    flush_logs()
+    writer = decorators._writers[filename]
+    thread = writer._thread
+    with monkeypatch.context() as patched:
+        patched.setattr(decorators._BufferedLogWriter, "_reopen_if_moved", mock.Mock(side_effect=OSError("диск")))
+        add(2, 3)
+        thread.join(2)
+    assert not thread.is_alive()
+
+    started = time.monotonic()
+    flush_logs()
+    assert time.monotonic() - started < 1
+    add(3, 4)  # Новый вызов запускает фоновую запись заново
+    flush_logs()
+    assert writer._thread is not thread
+
+    with open(filename, "r") as file:
+        results = [line for line in file if "вернула" in line]
+    assert results == ["Функция: add вернула: 3\n", "Функция: add вернула: 5\n", "Функция: add вернула: 7\n"]
+
+
+def test_timing_histograms_with_sampling():
+    """Тестирует выборочное измерение времени без записи вызовов в файл."""
+    reset_timings()
+
+    @log(None, timing=True, sample_rate=10)
+    def square(x):
+        return x * x
+
+    for i in range(100):
+        square(i)
+
+    stats = timing_summary()[f"{__name__}.test_timing_histograms_with_sampling.<locals>.square"]
+    assert stats["count"] == 10
+    assert 0 < stats["wall"]["p50"] <= stats["wall"]["p99"] <= stats["wall"]["max"]
+    assert "square: вызовов 10" in dump_timings()
+    reset_timings()
+
+
+def test_timing_log_with_capped_repr(clean_up):
+    """Тестирует запись длительности и ограничение длины аргументов в журнале."""
+
+    @log("test_log.txt", timing=True, max_repr=20)
+    def total(values):
+        return sum(values)
+
+    total(list(range(1000)))
+
+    with open("test_log.txt", "r") as file:
+        logs = file.readlines()
+
+    assert len(logs[0]) < 100
+    assert "Функция: total вернула: 499500\n" in logs
+    assert "Функция: total выполнена за" in logs[2]
+
+
+def test_async_function_logged(clean_up):
+    """Тестирует логирование результата и ошибки корутины, а не объекта корутины."""
+
+    @log("test_log.txt", timing=True)
+    async def fetch_rate(currency):
+        await asyncio.sleep(0)
+        if currency == "XXX":
+            raise ValueError("Неизвестная валюта")
+        return 74.21
+
+    assert asyncio.run(fetch_rate("USD")) == 74.21
+    with pytest.raises(ValueError):
+        asyncio.run(fetch_rate("XXX"))
+    flush_logs()
+
+    with open("test_log.txt", "r") as file:
+        logs = file.readlines()
+
+    assert "Функция: fetch_rate вернула: 74.21\n" in logs
+    assert any("Ошибка в функции: fetch_rate с аргументами: ('XXX',), {}" in log for log in logs)
+    assert sum("fetch_rate выполнена за" in log for log in logs) == 2
+
+
+def test_async_generator_logged(clean_up):
+    """Тестирует логирование асинхронного генератора после его исчерпания."""
+
+    @log("test_log.txt")
+    async def pages(count):
+        for page in range(count):
+            await asyncio.sleep(0)
+            yield page
+
+    async def collect():
+        return [page async for page in pages(3)]
+
+    assert asyncio.run(collect()) == [0, 1, 2]
+    flush_logs()
+
+    with open("test_log.txt", "r") as file:
+        assert "Функция: pages вернула: элементов: 3\n" in file.readlines()
+
+
+def test_async_log_does_not_block_on_full_queue(tmp_path, monkeypatch):
+    """Тестирует, что корутина не ждет места в очереди журнала, а лишние записи отбрасываются."""
+    filename = str(tmp_path / "log.txt")
+    release = threading.Event()
+    format_record = decorators._BufferedLogWriter._format_record
+
+    def stalled_format(record):
+        release.wait(5)
+        return format_record(record)
+
+    monkeypatch.setattr(decorators, "MAX_QUEUE_SIZE", 2)
+    monkeypatch.setattr(decorators._BufferedLogWriter, "_format_record", staticmethod(stalled_format))
+
+    @log(filename, flush_interval=0.01)
+    async def fetch_rate(currency):
+        return 74.21
+
+    async def fetch_many():
+        return [await fetch_rate("USD") for _ in range(10)]
+
+    started = time.monotonic()
+    assert asyncio.run(fetch_many()) == [74.21] * 10
+    assert time.monotonic() - started < 1
+    assert dropped_log_records()[filename] > 0
+
+    release.set()
+    flush_logs()
+    with open(filename, "r") as file:
+        results = [line for line in file if "вернула" in line]
+    assert len(results) == 10 - dropped_log_records()[filename]
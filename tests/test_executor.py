@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+from src.executor import ExecutorBusyError, WorkerExecutor
+
+
+def test_worker_executor_runs_tasks():
+    executor = WorkerExecutor(max_workers=2, max_queue=2)
+    try:
+        assert executor.submit(sum, [1, 2, 3]).result(timeout=1) == 6
+    finally:
+        executor.shutdown()
+
+
+def test_worker_executor_rejects_when_full():
+    executor = WorkerExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        first = executor.submit(release.wait, 5)
+        second = executor.submit(release.wait, 5)
+        with pytest.raises(ExecutorBusyError):
+            executor.submit(release.wait, 5)
+    finally:
+        release.set()
+
+    assert first.result(timeout=1) and second.result(timeout=1)
+    # После завершения задач места в очереди освобождаются
+    assert executor.submit(lambda: "ok").result(timeout=1) == "ok"
+    executor.shutdown()
+
+
+def test_worker_executor_recreated_after_shutdown():
+    executor = WorkerExecutor(max_workers=1)
+    executor.submit(lambda: None).result(timeout=1)
+    executor.shutdown()
+
+    assert executor.submit(lambda: 42).result(timeout=1) == 42
+    executor.shutdown()
@@ -1,6 +1,15 @@
 import pytest
 
-from src.generators import card_number_generator, filter_by_currency, transaction_descriptions, transactions
+from src.generators import (
+    card_number_chunks,
+    card_number_generator,
+    card_number_shards,
+    filter_by_currency,
+    group_by_currency,
+    luhn_check_digit,
+    transaction_descriptions,
+    transactions,
+)
 
 
 @pytest.mark.parametrize(
@@ -43,7 +52,7 @@ from src.generators import card_number_generator, filter_by_currency, transactio
                 }
             ],
         ),
-        ("GBP", ["Нет значений"]),  # Проверяем, что GBP нет
+        ("GBP", []),  # Проверяем, что GBP нет
     ],
 )
 def test_filter_by_currency(currency, expected):
@@ -94,6 +103,59 @@ def test_transaction_descriptions(dir_transaction, expected):
     assert descriptions == expected
 
 
+def test_transaction_descriptions_empty():
+    assert list(transaction_descriptions([])) == []
+    assert list(transaction_descriptions(iter([]))) == []
+
+
+def test_filter_by_currency_generator_source():
+    consumed = []
+
+    def source():
+        for transaction in transactions:
+            consumed.append(transaction.get("id"))
+            yield transaction
+
+    result = filter_by_currency(source(), "USD")
+    assert consumed == []  # Источник не читается до запроса первого элемента
+    assert next(result)["id"] == 939719570
+    assert consumed == [939719570]
+    assert [transaction["id"] for transaction in result] == [142264269]
+
+
+def test_filter_by_currency_flat_rows():
+    rows = [
+        {"id": 1, "amount": 10.0, "currency_name": "руб.", "currency_code": "RUB"},
+        {"id": 2, "amount": 20.0, "currency_name": "USD", "currency_code": "USD"},
+        {},
+        None,
+    ]
+    assert [row["id"] for row in filter_by_currency(rows, "RUB")] == [1]
+    assert [row["id"] for row in filter_by_currency(iter(rows), "руб.")] == [1]
+    assert list(filter_by_currency(rows, "EUR")) == []
+
+
+def test_group_by_currency():
+    rows = [
+        {"id": 1, "amount": 10.0, "currency_name": "руб.", "currency_code": "RUB"},
+        {"id": 2, "amount": 20.0, "currency_name": "USD", "currency_code": "USD"},
+        {"id": 3, "amount": 30.0, "currency_name": "руб.", "currency_code": "RUB"},
+    ]
+    groups = group_by_currency(iter(transactions + rows))
+
+    assert [transaction["id"] for transaction in groups["USD"]] == [939719570, 142264269, 2]
+    assert [transaction["id"] for transaction in groups["EUR"]] == [142264268]
+    assert [transaction["id"] for transaction in groups["RUB"]] == [1, 3]
+    # Каждая группа совпадает с результатом filter_by_currency для этой валюты
+    for code, group in groups.items():
+        assert group == list(filter_by_currency(transactions + rows, code))
+
+
+def test_group_by_currency_selected():
+    assert list(group_by_currency(transactions, currencies=["EUR", "GBP"])) == ["EUR"]
+    assert group_by_currency([]) == {}
+
+
 @pytest.fixture
 def card_number_test_data():
     return {
@@ -142,3 +204,32 @@ def test_empty_card_number_generator(empty_card_number_test_data):
 
     # Проверка соответствия с ожидаемым значением
     assert result == expected
+
+
+def test_card_number_generator_luhn_only():
+    result = list(card_number_generator(4000000000000000, 4000000000000030, luhn_only=True))
+
+    assert result == ["4000 0000 0000 0002", "4000 0000 0000 0010", "4000 0000 0000 0028"]
+    assert luhn_check_digit(7992739871) == 3
+
+
+@pytest.mark.parametrize("luhn_only", [False, True])
+def test_card_number_chunks(luhn_only):
+    expected = list(card_number_generator(95, 1234, luhn_only))
+
+    chunks = list(card_number_chunks(95, 1234, chunk_size=50, luhn_only=luhn_only))
+    numpy_chunks = list(card_number_chunks(95, 1234, chunk_size=50, luhn_only=luhn_only, as_numpy=True))
+
+    assert all(len(chunk) <= 50 for chunk in chunks + numpy_chunks)
+    assert [number for chunk in chunks for number in chunk] == expected
+    assert [str(number) for chunk in numpy_chunks for number in chunk] == expected
+
+
+def test_card_number_shards_cover_range():
+    shards = card_number_shards(1, 10, 3)
+
+    assert shards == [(1, 4), (5, 7), (8, 10)]
+    assert [number for shard in shards for number in card_number_generator(*shard)] == list(
+        card_number_generator(1, 10)
+    )
+    assert card_number_shards(6, 5, 2) == []
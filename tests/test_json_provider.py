@@ -0,0 +1,53 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from src.json_provider import OrjsonProvider, init_json_provider, orjson
+
+pytestmark = pytest.mark.skipif(orjson is None, reason="orjson не установлен")
+
+
+def test_orjson_provider_used():
+    app = Flask(__name__)
+    init_json_provider(app)
+
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_orjson_provider_response():
+    app = Flask(__name__)
+    init_json_provider(app)
+
+    with app.app_context():
+        response = jsonify({"description": "Перевод организации", "amount": Decimal("9824.07"), 1: "ключ"})
+
+    assert response.mimetype == "application/json"
+    assert response.get_data(as_text=True) == '{"1":"ключ","amount":"9824.07","description":"Перевод организации"}\n'
+    assert app.json.loads(response.get_data())["amount"] == "9824.07"
+
+
+@pytest.mark.parametrize("sort_keys", [True, False])
+def test_orjson_provider_key_order_matches_default(sort_keys):
+    app = Flask(__name__)
+    data = {"stock_prices": [], "greeting": "Добрый день", "cards": [{"total_spent": 1, "last_digits": "5814"}]}
+    default_provider, orjson_provider = DefaultJSONProvider(app), OrjsonProvider(app)
+    default_provider.sort_keys = orjson_provider.sort_keys = sort_keys
+
+    expected = default_provider.dumps(data)
+    assert json.dumps(json.loads(orjson_provider.dumps(data)), sort_keys=False) == json.dumps(
+        json.loads(expected), sort_keys=False
+    )
+    assert orjson_provider.dumps(data, indent=4) == default_provider.dumps(data, indent=4)
+
+
+def test_orjson_provider_dates_match_default():
+    app = Flask(__name__)
+    data = {"date": date(2020, 5, 1), "created": datetime(2020, 5, 1, 12, 30, tzinfo=timezone.utc)}
+
+    result = json.loads(OrjsonProvider(app).dumps(data))
+    assert result == json.loads(DefaultJSONProvider(app).dumps(data))
+    assert result["date"] == "Fri, 01 May 2020 00:00:00 GMT"
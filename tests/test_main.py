@@ -2,7 +2,7 @@ import os
 import unittest
 from unittest.mock import patch
 
-from src.main import get_transaction_choice, main, print_transactions, process_transactions
+from src.main import get_transaction_choice, main, print_currency_summary, print_transactions, process_transactions
 
 
 class TestPrintTransactions(unittest.TestCase):
@@ -33,6 +33,26 @@ class TestPrintTransactions(unittest.TestCase):
             )
 
 
+class TestPrintCurrencySummary(unittest.TestCase):
+    @patch("builtins.print")
+    def test_print_currency_summary(self, mock_print):
+        transactions = [
+            {"date": "2023-01-01", "amount": 100.0, "currency_code": "USD"},
+            {"date": "2023-01-02", "amount": 50.0, "currency_code": "RUB"},
+            {"date": "2023-01-03", "amount": 70.0, "currency_code": "RUB"},
+        ]
+        print_currency_summary(transactions)
+
+        self.assertEqual(
+            [call.args[0] for call in mock_print.call_args_list], ["Операции по валютам:", "RUB: 2", "USD: 1"]
+        )
+
+    @patch("builtins.print")
+    def test_print_currency_summary_empty(self, mock_print):
+        print_currency_summary([])
+        mock_print.assert_not_called()
+
+
 class TestGetTransactionChoice(unittest.TestCase):
 
     @patch("builtins.print")
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from src.metrics import MetricsRegistry, instrument, stage_calls, stage_duration, stage_items
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    requests_total = registry.counter("requests_total", "Количество запросов", ("route",))
+    in_progress = registry.gauge("in_progress", "Запросы в обработке")
+
+    requests_total.inc(route="/currency")
+    requests_total.inc(2, route="/currency")
+    in_progress.inc()
+    in_progress.dec()
+
+    assert requests_total.value(route="/currency") == 3
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/currency"} 3' in text
+    assert "in_progress 0" in text
+
+
+def test_counter_rejects_negative_and_unknown_labels():
+    counter = MetricsRegistry().counter("calls_total", "Количество вызовов", ("stage",))
+    with pytest.raises(ValueError):
+        counter.inc(-1, stage="load")
+    with pytest.raises(ValueError):
+        counter.inc(route="/")
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = MetricsRegistry().histogram("duration_seconds", "Длительность", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value)
+
+    text = histogram.render()
+    assert 'duration_seconds_bucket{le="0.1"} 1' in text
+    assert 'duration_seconds_bucket{le="1.0"} 3' in text
+    assert 'duration_seconds_bucket{le="+Inf"} 4' in text
+    assert "duration_seconds_sum 6.05" in text
+    assert "duration_seconds_count 4" in text
+
+
+def test_registry_returns_same_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("calls_total", "Вызовы") is registry.counter("calls_total", "Вызовы")
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Вызовы")
+
+
+def test_instrument_function_and_generator():
+    @instrument("test_filter")
+    def keep_positive(values):
+        return [value for value in values if value > 0]
+
+    @instrument("test_stream")
+    def stream(values):
+        yield from values
+
+    calls_before = stage_calls.value(stage="test_filter", status="ok")
+    assert keep_positive([1, -2, 3]) == [1, 3]
+    assert list(stream([1, 2, 3])) == [1, 2, 3]
+
+    assert stage_calls.value(stage="test_filter", status="ok") == calls_before + 1
+    assert stage_items.value(stage="test_stream") >= 3
+    assert stage_duration.count(stage="test_stream") >= 1
+
+
+def test_instrument_counts_errors():
+    @instrument("test_failing")
+    def failing():
+        raise ValueError("Ошибка загрузки")
+
+    with pytest.raises(ValueError):
+        failing()
+    assert stage_calls.value(stage="test_failing", status="error") >= 1
+
+
+def test_instrument_generator_closed_early_and_consumer_time():
+    @instrument("test_early_close")
+    def stream(values):
+        yield from values
+
+    calls_before = stage_calls.value(stage="test_early_close", status="ok")
+    generator = stream([1, 2, 3])
+    assert next(generator) == 1
+    time.sleep(0.05)  # Время потребителя между элементами не входит в длительность этапа
+    generator.close()
+
+    assert stage_calls.value(stage="test_early_close", status="ok") == calls_before + 1
+    assert stage_items.value(stage="test_early_close") == 1
+    assert stage_duration.sum(stage="test_early_close") < 0.05
+
+
+def test_instrument_generator_error():
+    @instrument("test_stream_error")
+    def stream():
+        yield 1
+        raise ValueError("Ошибка чтения")
+
+    with pytest.raises(ValueError):
+        list(stream())
+    assert stage_calls.value(stage="test_stream_error", status="error") == 1
+    assert stage_calls.value(stage="test_stream_error", status="ok") == 0
@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+
+from src.aggregates import CardAggregates
+from src.operations import load_operations, top_transactions
+
+
+@pytest.fixture
+def operations():
+    return [
+        {
+            "date": "2021-12-31",
+            "card_number": "*7197",
+            "status": "OK",
+            "amount": -160.89,
+            "category": "Супермаркеты",
+            "description": "Колхоз",
+        },
+        {
+            "date": "2021-12-31",
+            "card_number": "*7197",
+            "status": "OK",
+            "amount": -64.0,
+            "category": "Супермаркеты",
+            "description": "Колхоз",
+        },
+        {
+            "date": "2021-12-30",
+            "card_number": "*5091",
+            "status": "OK",
+            "amount": -1198.23,
+            "category": "Переводы",
+            "description": "Перевод Кредитная карта",
+        },
+        {
+            "date": "2021-12-30",
+            "card_number": "*5091",
+            "status": "FAILED",
+            "amount": -5000.0,
+            "category": "Переводы",
+            "description": "Отклонено",
+        },
+        {
+            "date": "2021-12-29",
+            "card_number": "",
+            "status": "OK",
+            "amount": 33000.0,
+            "category": "Пополнения",
+            "description": "Пополнение",
+        },
+    ]
+
+
+def test_card_summary(operations):
+    assert CardAggregates(operations).summary() == [
+        {"last_digits": "7197", "total_spent": 224.89, "cashback": 2.25, "count": 2},
+        {"last_digits": "5091", "total_spent": 1198.23, "cashback": 11.98, "count": 1},
+    ]
+
+
+def test_top_transactions(operations):
+    result = top_transactions(operations, count=2)
+
+    assert result == [
+        {"date": "2021-12-29", "amount": 33000.0, "category": "Пополнения", "description": "Пополнение"},
+        {"date": "2021-12-30", "amount": 1198.23, "category": "Переводы", "description": "Перевод Кредитная карта"},
+    ]
+
+
+def test_load_operations(tmp_path):
+    path = tmp_path / "operations.xlsx"
+    pd.DataFrame(
+        [
+            {
+                "Дата операции": "31.12.2021 16:44:00",
+                "Номер карты": "*7197",
+                "Статус": "OK",
+                "Сумма платежа": -160.89,
+                "Категория": "Супермаркеты",
+                "Описание": "Колхоз",
+            },
+            {
+                "Дата операции": "30.12.2021 10:00:00",
+                "Номер карты": None,
+                "Статус": "OK",
+                "Сумма платежа": 33000,
+                "Категория": None,
+                "Описание": "Пополнение",
+            },
+        ]
+    ).to_excel(path, index=False)
+
+    result = load_operations(str(path))
+
+    assert result[0] == {
+        "date": "2021-12-31",
+        "card_number": "*7197",
+        "status": "OK",
+        "amount": -160.89,
+        "category": "Супермаркеты",
+        "description": "Колхоз",
+    }
+    assert result[1]["card_number"] == ""
+    assert result[1]["category"] == ""
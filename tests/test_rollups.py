@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from src.rollups import ExpenseRollup
+
+
+@pytest.fixture
+def rollup():
+    return ExpenseRollup(
+        [
+            {"date": "2020-04-30", "amount": -500, "category": "Супермаркеты"},
+            {"date": "2020-05-01", "amount": -17319, "category": "Супермаркеты"},
+            {"date": "2020-05-02", "amount": -3324, "category": "Фастфуд"},
+            {"date": "2020-05-02", "amount": -100, "category": "Фастфуд"},
+            {"date": "2020-05-10", "amount": 33000, "category": "Пополнение_BANK007"},
+            {"date": "2020-06-01", "amount": -2289, "category": "Топливо"},
+        ]
+    )
+
+
+def test_month_to_date(rollup):
+    assert rollup.category_totals(date(2020, 5, 1), date(2020, 5, 2)) == {"Супермаркеты": 17319, "Фастфуд": 3424}
+
+
+def test_range_across_months_uses_monthly_buckets(rollup):
+    rollup._daily.clear()  # Полные месяцы должны браться только из месячных корзин
+    assert rollup.category_totals(date(2020, 5, 1), date(2020, 6, 30)) == {
+        "Супермаркеты": 17319,
+        "Фастфуд": 3424,
+        "Топливо": 2289,
+    }
+
+
+def test_partial_months(rollup):
+    assert rollup.category_totals(date(2020, 4, 30), date(2020, 5, 1)) == {"Супермаркеты": 17819}
+
+
+def test_incremental_add(rollup):
+    rollup.add({"date": "2020-05-03", "amount": -1850, "category": "Развлечения"})
+
+    assert rollup.category_totals(date(2020, 5, 3), date(2020, 5, 3)) == {"Развлечения": 1850}
+    assert rollup.category_totals(date(2020, 5, 1), date(2020, 5, 31))["Развлечения"] == 1850
+
+
+def test_empty_period(rollup):
+    assert rollup.category_totals(date(2021, 1, 1), date(2021, 1, 31)) == {}
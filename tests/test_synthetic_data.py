@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic_data import card_number, iter_operations, write_dataset
+from src.generators import luhn_check_digit
+from src.masks import get_mask_account, get_mask_card_number
+from src.transactions_csv import iter_financial_transactions
+from src.transactions_xlsx import iter_financial_transactions_operations
+from src.utils import load_transactions
+
+
+def test_operations_are_reproducible():
+    assert list(iter_operations(50, seed=7)) == list(iter_operations(50, seed=7))
+    assert list(iter_operations(50, seed=7)) != list(iter_operations(50, seed=8))
+
+
+def test_card_and_account_numbers_are_valid():
+    rng = random.Random(1)
+    number = card_number(rng)
+    assert len(number) == 16
+    assert luhn_check_digit(int(number[:-1])) == int(number[-1])
+    get_mask_card_number(int(number))
+
+    accounts = [
+        operation["to"].split()[-1] for operation in iter_operations(200) if operation["to"].startswith("Счет")
+    ]
+    assert accounts and all(len(get_mask_account(int(account))) == 19 for account in accounts)
+
+
+def test_files_load_with_project_loaders(tmp_path):
+    for file_format in ("json", "csv", "xlsx"):
+        write_dataset(str(tmp_path / f"operations.{file_format}"), 100, seed=3)
+
+    expected = list(iter_operations(100, seed=3))
+    assert load_transactions(str(tmp_path / "operations.json")) == expected
+
+    csv_rows = list(iter_financial_transactions(str(tmp_path / "operations.csv")))
+    xlsx_rows = list(iter_financial_transactions_operations(str(tmp_path / "operations.xlsx")))
+    assert [int(row["id"]) for row in csv_rows] == [operation["id"] for operation in expected]
+    assert [row["currency_code"] for row in xlsx_rows] == [
+        operation["operationAmount"]["currency"]["code"] for operation in expected
+    ]
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        write_dataset(str(tmp_path / "operations.txt"), 10)
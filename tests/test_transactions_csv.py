@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import mock_open, patch
 
 # Импортируем ваш функцию
-from src.transactions_csv import get_financial_transactions
+from src.transactions_csv import get_financial_transactions, iter_financial_transactions
 
 
 class TestGetFinancialTransactions(unittest.TestCase):
@@ -77,6 +77,22 @@ class TestGetFinancialTransactions(unittest.TestCase):
         # Проверяем, что open вызван с правильным путем
         mock_open.assert_called_once_with(path, mode="r", newline="", encoding="utf-8")
 
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data="id;state;date;amount;currency_name;currency_code;from;to;description"
+        "\n1;EXECUTED;2023-01-01;100;USD;USD;Alice;Bob;Payment"
+        "\n2;PENDING;2023-02-01;200;EUR;EUR;Alice;Charlie;Transfer"
+        "\n",
+    )
+    def test_iter_financial_transactions(self, mock_open):
+        transactions = iter_financial_transactions("dummy_path.csv")
+
+        first = next(transactions)
+        self.assertEqual(first["id"], "1")
+        self.assertEqual(first["description"], "Payment")
+        self.assertEqual([row["id"] for row in transactions], ["2"])
+
 
 if __name__ == "__main__":
     unittest.main()
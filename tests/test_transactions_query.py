@@ -0,0 +1,100 @@
+import pytest
+
+from src.transactions_csv import iter_financial_transactions_from
+from src.transactions_query import decode_cursor, encode_cursor, parse_date, query_transactions
+
+
+@pytest.fixture
+def operations():
+    return [
+        {
+            "id": 1,
+            "state": "EXECUTED",
+            "date": "2019-08-26T10:50:58.294041",
+            "operationAmount": {"amount": "31957.58", "currency": {"name": "руб.", "code": "RUB"}},
+            "description": "Перевод организации",
+        },
+        {
+            "id": "2",
+            "state": "CANCELED",
+            "date": "2020-12-06T23:00:58Z",
+            "amount": "29740",
+            "currency_name": "Peso",
+            "currency_code": "COP",
+            "description": "Перевод с карты на карту",
+        },
+        {
+            "id": "3",
+            "state": "EXECUTED",
+            "date": "2023-09-05T11:30:32Z",
+            "amount": "16210",
+            "currency_name": "Ruble",
+            "currency_code": "RUB",
+            "description": None,
+        },
+        {},
+    ]
+
+
+def test_query_by_state_and_currency(operations):
+    result = list(query_transactions(operations, state="executed", currency="rub"))
+
+    assert [position for position, _ in result] == [0, 2]
+
+
+def test_query_by_description_escapes_pattern(operations):
+    assert [t["id"] for _, t in query_transactions(operations, description="карты на")] == ["2"]
+    assert list(query_transactions(operations, description="(")) == []
+
+
+def test_query_by_dates(operations):
+    result = query_transactions(operations, date_from="2020-01-01", date_to="2020-12-31", chunk_size=1)
+
+    assert [t["id"] for _, t in result] == ["2"]
+
+
+def test_query_is_lazy():
+    def source():
+        yield {"state": "EXECUTED", "id": 1}
+        raise AssertionError("Источник прочитан дальше, чем нужно")
+
+    assert next(query_transactions(source(), state="EXECUTED", chunk_size=1)) == (0, {"state": "EXECUTED", "id": 1})
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("csv", 120), "csv") == 120
+    assert decode_cursor(None, "csv") == 0
+
+
+@pytest.mark.parametrize("cursor", ["не курсор", encode_cursor("json", 10), encode_cursor("csv", -1)])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "csv")
+
+
+def test_parse_date():
+    assert parse_date("2020-05-01") == "2020-05-01"
+    assert parse_date(None) is None
+    with pytest.raises(ValueError):
+        parse_date("01.05.2020")
+
+
+def test_csv_resumes_from_byte_offset(tmp_path):
+    path = tmp_path / "transactions.csv"
+    path.write_text('id;state;description\n1;EXECUTED;Перевод\n2;CANCELED;"Две\nстроки"\n3;EXECUTED;Вклад\n', "utf-8")
+
+    rows = list(iter_financial_transactions_from(str(path)))
+    assert [row["id"] for _, row in rows] == ["1", "2", "3"]
+    assert rows[1][1]["description"] == "Две\nстроки"
+    # Чтение с сохраненной позиции продолжается со следующей записи
+    assert [row["id"] for _, row in iter_financial_transactions_from(str(path), rows[0][0])] == ["2", "3"]
+    assert list(iter_financial_transactions_from(str(path), rows[-1][0])) == []
+    with pytest.raises(ValueError):
+        list(iter_financial_transactions_from(str(path), rows[0][0] + 1))
+
+
+def test_query_positioned_source(operations):
+    pairs = [(position * 10, transaction) for position, transaction in enumerate(operations)]
+    result = query_transactions(pairs, state="EXECUTED", positioned=True)
+
+    assert [position for position, _ in result] == [0, 20]
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 # Импортируем тестируемую функцию
-from src.transactions_xlsx import get_financial_transactions_operations
+from src.transactions_xlsx import get_financial_transactions_operations, iter_financial_transactions_operations
 
 
 class TestFinancialTransactions(unittest.TestCase):
@@ -62,6 +62,30 @@ class TestFinancialTransactions(unittest.TestCase):
         # Проверяем, что возвращаемый список операций пуст
         self.assertEqual(operations, [])
 
+    @patch("openpyxl.load_workbook")
+    def test_iter_financial_transactions_operations(self, mock_load_workbook):
+        workbook = mock_load_workbook.return_value
+        workbook.active.iter_rows.return_value = iter(
+            [
+                ("id", "state", "description"),
+                (1, "EXECUTED", "Перевод организации"),
+                (None, None, None),  # Пустая строка пропускается
+                (2, "CANCELED", "Перевод с карты на карту"),
+            ]
+        )
+
+        operations = list(iter_financial_transactions_operations("dummy_path.xlsx"))
+
+        self.assertEqual(
+            operations,
+            [
+                {"id": 1, "state": "EXECUTED", "description": "Перевод организации"},
+                {"id": 2, "state": "CANCELED", "description": "Перевод с карты на карту"},
+            ],
+        )
+        mock_load_workbook.assert_called_once_with("dummy_path.xlsx", read_only=True)
+        workbook.close.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,7 @@ import os
 import unittest
 from unittest.mock import mock_open, patch
 
-from src.utils import load_transactions
+from src.utils import iter_transactions, load_transactions
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 path = os.path.join(base_dir, "data/transactions.json")
@@ -28,6 +28,20 @@ class TestLoadTransactions(unittest.TestCase):
         self.assertEqual(result[0]["id"], 1)  # Проверяем корректность id
         self.assertEqual(result[0]["operationAmount"]["amount"], "100.00")  # Проверяем корректность amount
 
+    @patch("os.path.exists")
+    @patch(
+        "builtins.open",
+        new_callable=mock_open,
+        read_data='[{"id": 1, "operationAmount": {"amount": "100.00"}}, {"id": "x"}, {}]',
+    )
+    def test_iter_transactions_skips_invalid(self, mock_open, mock_exists):
+        """Тестирование генератора, выдающего только валидные транзакции."""
+        mock_exists.return_value = True
+
+        result = list(iter_transactions("data/transactions.json"))
+
+        self.assertEqual(result, [{"id": 1, "operationAmount": {"amount": "100.00"}}])
+
 
 if __name__ == "__main__":
     unittest.main()
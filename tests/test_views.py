@@ -3,7 +3,29 @@ import unittest
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
-from src.views import calculate_expenses, filter_transactions, generate_report, get_currency_data, get_stock_data
+import pandas as pd
+import requests
+
+from src.date_index import TransactionDateIndex
+from src.rollups import ExpenseRollup
+from src.views import (
+    add_transaction,
+    calculate_expenses,
+    calculate_expenses_vectorized,
+    filter_transactions,
+    generate_report,
+    generate_reports,
+    get_cached_currency_data,
+    get_cached_stock_data,
+    get_currency_data,
+    get_stock_data,
+    get_stocks_data,
+    month_to_date_expenses,
+    rates_cache,
+    read_latest_daily_entry,
+    stock_breaker,
+    stock_cache,
+)
 
 
 class TestFinanceModule(unittest.TestCase):
@@ -39,6 +61,17 @@ class TestFinanceModule(unittest.TestCase):
         expected = [{"currency": "USD", "rate": 74.21}, {"currency": "EUR", "rate": 88.47}]
         self.assertEqual(results, expected)
 
+    @patch("src.views.get_currency_data")
+    def test_get_cached_currency_data(self, mock_get_currency_data):
+        """Тест повторного чтения курсов валют из кэша без обращения к API."""
+        rates_cache.clear()
+        mock_get_currency_data.return_value = [{"currency": "USD", "rate": 74.21}]
+
+        self.assertEqual(get_cached_currency_data(), [{"currency": "USD", "rate": 74.21}])
+        self.assertEqual(get_cached_currency_data(), [{"currency": "USD", "rate": 74.21}])
+        mock_get_currency_data.assert_called_once()
+        rates_cache.clear()
+
     def test_filter_transactions(self):
         """Тест фильтрации транзакций по дате."""
         start_date = datetime.strptime("2020-05-01", "%Y-%m-%d")
@@ -46,12 +79,45 @@ class TestFinanceModule(unittest.TestCase):
         filtered = filter_transactions(start_date, end_date)
         self.assertEqual(len(filtered), 3)  # Должно вернуть 3 транзакции
 
+    def test_add_transaction_updates_all_views(self):
+        """Тест добавления транзакции: выборка за период и расходы с начала месяца видят ее одновременно."""
+        transaction = {"date": "2020-05-03", "amount": -500, "category": "Фастфуд"}
+        with patch("src.views.transactions", list(self.transactions)), patch(
+            "src.views.expense_rollup", ExpenseRollup(self.transactions)
+        ), patch("src.views.transactions_index", TransactionDateIndex(self.transactions)):
+            add_transaction(transaction)
+
+            period = filter_transactions(datetime(2020, 5, 1), datetime(2020, 5, 3))
+            self.assertIn(transaction, period)
+            self.assertEqual(month_to_date_expenses(datetime(2020, 5, 3).date()), calculate_expenses(period))
+
     def test_calculate_expenses(self):
         """Тест калькуляции расходов."""
         expenses = calculate_expenses(self.transactions)
         self.assertEqual(expenses["total_amount"], 24782)  # Общая сумма расходов
         self.assertEqual(len(expenses["main"]), 5)  # Должно вернуть 5 основные категории
 
+    def test_calculate_expenses_accepts_generator(self):
+        """Тест расчета расходов по генератору транзакций за один проход."""
+        expenses = calculate_expenses(t for t in self.transactions)
+        self.assertEqual(expenses, calculate_expenses(self.transactions))
+
+    def test_calculate_expenses_top_categories(self):
+        """Тест выбора 6 основных категорий и суммы остальных."""
+        transactions = [{"amount": -100 * (i + 1), "category": f"Категория {i}"} for i in range(8)]
+        expenses = calculate_expenses(transactions)
+
+        categories = [item["category"] for item in expenses["main"]]
+        self.assertEqual(categories, [f"Категория {i}" for i in range(7, 1, -1)] + ["Остальное"])
+        self.assertEqual(expenses["main"][-1]["amount"], 300)  # 100 + 200
+        self.assertEqual(expenses["total_amount"], 3600)
+
+    def test_calculate_expenses_vectorized(self):
+        """Тест совпадения векторного расчета с однопроходным."""
+        expected = calculate_expenses(self.transactions)
+        self.assertEqual(calculate_expenses_vectorized(self.transactions), expected)
+        self.assertEqual(calculate_expenses(pd.DataFrame(self.transactions)), expected)
+
     @patch("src.views.requests.get")
     def test_get_stock_data(self, mock_get):
         """Тест получения данных о фондовом рынке."""
@@ -64,6 +130,38 @@ class TestFinanceModule(unittest.TestCase):
         result = get_stock_data("AAPL")
         self.assertEqual(result, [{"stock": "AAPL", "price": 100.00}])
 
+    @patch("src.views.requests.get")
+    def test_get_stock_data_stream(self, mock_get):
+        """Тест потокового разбора ответа: читается только начало временного ряда."""
+        payload = (
+            b'{"Meta Data": {"2. Symbol": "AAPL"}, "Time Series (Daily)": '
+            b'{"2020-05-15": {"4. close": "100.00"}, "2020-05-14": {"4. close": "99.00"}}}'
+        )
+        chunks = [payload[i : i + 5] for i in range(0, len(payload), 5)]
+        consumed = []
+
+        def iter_content(chunk_size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        mock_response = MagicMock()
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.status_code = 200
+        mock_response.iter_content.side_effect = iter_content
+        mock_get.return_value = mock_response
+
+        result = get_stock_data("AAPL", stream=True)
+        self.assertEqual(result, [{"stock": "AAPL", "price": 100.00}])
+        self.assertLess(len(consumed), len(chunks))  # Остаток ответа не прочитан
+        mock_response.close.assert_called_once()
+        self.assertIn("outputsize=compact", mock_get.call_args[0][0])
+
+    def test_read_latest_daily_entry_without_series(self):
+        """Тест потокового разбора ответа без временного ряда."""
+        self.assertIsNone(read_latest_daily_entry([b'{"Note": "API call frequency exceeded"}']))
+        self.assertIsNone(read_latest_daily_entry([b'{"Time Series (Daily)": {}}']))
+
     @patch("src.views.requests.get")
     def test_get_stock_data_invalid_json(self, mock_get):
         """Тест получения данных о фондовом рынке с некорректным JSON."""
@@ -80,25 +178,146 @@ class TestFinanceModule(unittest.TestCase):
             "Ошибка парсинга JSON: Получена некорректная страница вместо JSON. Проверьте API URL и ключ.",
         )
 
+    @patch("src.views.get_stock_data")
+    def test_get_stocks_data_uses_cache(self, mock_get_stock_data):
+        """Тест пакетного получения котировок: повторный запрос берется из кэша."""
+        stock_cache.clear()
+        mock_get_stock_data.side_effect = lambda symbol: [{"stock": symbol, "price": 100.00}]
+
+        results, errors = get_stocks_data(["AAPL", "msft"])
+        self.assertEqual(set(results), {"AAPL", "MSFT"})
+        self.assertEqual(errors, {})
+
+        get_stocks_data(["AAPL"])
+        self.assertEqual(mock_get_stock_data.call_count, 2)
+        stock_cache.clear()
+
+    @patch("src.views.requests.get")
+    def test_unknown_symbols_do_not_open_breaker(self, mock_get):
+        """Тест: ответы 404 для неизвестных символов не размыкают предохранитель, а ответы 5xx размыкают."""
+        stock_cache.clear()
+        stock_breaker.reset()
+
+        def response(status_code):
+            mock_response = MagicMock(status_code=status_code)
+            mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=mock_response)
+            return mock_response
+
+        mock_get.side_effect = lambda *args, **kwargs: response(404)
+        for index in range(stock_breaker.failure_threshold + 1):
+            _, errors = get_stocks_data([f"BOGUS{index}"])
+            self.assertEqual(errors, {f"BOGUS{index}": "Акции не найдены."})
+        self.assertEqual(stock_breaker.state, "closed")
+
+        mock_get.side_effect = lambda *args, **kwargs: response(503)
+        for index in range(stock_breaker.failure_threshold):
+            get_stocks_data([f"DOWN{index}"])
+        self.assertEqual(stock_breaker.state, "open")
+        stock_breaker.reset()
+        stock_cache.clear()
+
+    @patch("src.views.get_currency_data")
+    @patch("src.views.get_stock_data")
+    def test_generate_report_matches_full_scan(self, mock_get_stock_data, mock_get_currency_data):
+        """Тест совпадения расходов из предрассчитанных корзин с расчетом по всем транзакциям."""
+        report = generate_report("2020-05-03", "AAPL")
+
+        start_date = datetime.strptime("2020-05-01", "%Y-%m-%d")
+        end_date = datetime.strptime("2020-05-03", "%Y-%m-%d")
+        expected = calculate_expenses(filter_transactions(start_date, end_date))
+        self.assertEqual(report["expenses"], expected)
+
+    @patch("src.views.get_stock_data")
+    def test_stale_stock_data_reported_as_error(self, mock_get_stock_data):
+        """Тест недоступности API: устаревшая котировка возвращается только вместе с ошибкой."""
+        stock_cache.clear()
+        stock_cache.set("AAPL", [{"stock": "AAPL", "price": 100.00}], ttl=-1)  # Запись уже устарела
+        mock_get_stock_data.side_effect = ValueError("Ошибка сети или запроса: timeout")
+
+        with self.assertRaises(ValueError):
+            get_cached_stock_data("AAPL")
+        results, errors = get_stocks_data(["AAPL", "MSFT"])
+        self.assertEqual(results, {"AAPL": [{"stock": "AAPL", "price": 100.00}]})
+        self.assertEqual(
+            errors, {"AAPL": "Ошибка сети или запроса: timeout", "MSFT": "Ошибка сети или запроса: timeout"}
+        )
+        stock_breaker.reset()
+        stock_cache.clear()
+
     @patch("src.views.get_currency_data")
     @patch("src.views.get_stock_data")
-    @patch("src.views.filter_transactions")
-    @patch("src.views.calculate_expenses")
-    def test_generate_report(
-        self, mock_calculate_expenses, mock_filter_transactions, mock_get_stock_data, mock_get_currency_data
-    ):
-        """Тест генерации финансового отчета."""
-        mock_filter_transactions.return_value = self.transactions
-        mock_calculate_expenses.return_value = {"total_amount": 24782, "main": []}
+    def test_generate_report(self, mock_get_stock_data, mock_get_currency_data):
+        """Тест генерации финансового отчета: расходы с начала месяца берутся из предрассчитанных корзин."""
+        stock_cache.clear()
         mock_get_currency_data.return_value = [{"currency": "USD", "rate": 74.21}]
         mock_get_stock_data.return_value = [{"stock": "AAPL", "price": 100.00}]
 
         report = generate_report("2020-05-15", "AAPL")
 
-        self.assertIn("expenses", report)
-        self.assertIn("currency_rates", report)
-        self.assertIn("stock_prices", report)
+        self.assertEqual(
+            report["expenses"],
+            {
+                "total_amount": 24782,
+                "main": [
+                    {"category": "Супермаркеты", "amount": 17319},
+                    {"category": "Фастфуд", "amount": 3324},
+                    {"category": "Топливо", "amount": 2289},
+                    {"category": "Развлечения", "amount": 1850},
+                    {"category": "Остальное", "amount": 0},
+                ],
+            },
+        )
+        self.assertEqual(report["currency_rates"], [{"currency": "USD", "rate": 74.21}])
         self.assertEqual(report["stock_prices"], [{"stock": "AAPL", "price": 100.00}])
+        stock_cache.clear()
+
+    @patch("src.views.get_currency_data")
+    @patch("src.views.get_stock_data")
+    def test_generate_reports_shares_fetches(self, mock_get_stock_data, mock_get_currency_data):
+        """Тест пакетной генерации: один запрос курсов и один запрос котировки на символ."""
+        stock_cache.clear()
+        mock_get_currency_data.return_value = [{"currency": "USD", "rate": 74.21}]
+        mock_get_stock_data.side_effect = lambda symbol: [{"stock": symbol, "price": 100.00}]
+        dates = ["2020-05-03", "2020-05-15", "2020-05-01", "2020-05-03"]
+
+        reports = generate_reports([(date_str, "AAPL") for date_str in dates] + [("2020-05-10", "MSFT")])
+
+        mock_get_currency_data.assert_called_once()
+        self.assertEqual(mock_get_stock_data.call_count, 2)
+        for date_str, report in zip(dates, reports):
+            self.assertEqual(report, generate_report(date_str, "AAPL"))
+        self.assertEqual(reports[-1]["stock_prices"], [{"stock": "MSFT", "price": 100.00}])
+        stock_cache.clear()
+
+    @patch("src.views.get_currency_data")
+    @patch("src.views.get_stock_data")
+    def test_generate_report_raises_stock_error(self, mock_get_stock_data, mock_get_currency_data):
+        """Тест одиночного отчета: ошибка котировки поднимается, символ передается как есть, кэш не используется."""
+        stock_cache.clear()
+        stock_cache.set("AAPL", [{"stock": "AAPL", "price": 100.00}])
+        mock_get_currency_data.return_value = []
+        mock_get_stock_data.side_effect = ValueError("Данные не найдены")
+
+        with self.assertRaises(ValueError):
+            generate_report("2020-05-04", "aapl")
+        mock_get_stock_data.assert_called_once_with("aapl")
+        stock_cache.clear()
+
+    @patch("src.views.get_currency_data")
+    @patch("src.views.get_stock_data")
+    def test_generate_reports_keeps_stock_error(self, mock_get_stock_data, mock_get_currency_data):
+        """Тест сохранения ошибки котировки в пакетном отчете."""
+        stock_cache.clear()
+        mock_get_currency_data.return_value = []
+        mock_get_stock_data.side_effect = ValueError("Данные не найдены")
+
+        report = generate_reports([("2020-05-04", "AAPL")])[0]
+
+        expected = calculate_expenses(filter_transactions(datetime(2020, 5, 1), datetime(2020, 5, 4)))
+        self.assertEqual(report["expenses"], expected)
+        self.assertEqual(report["stock_prices"], [])
+        self.assertEqual(report["errors"], {"AAPL": "Данные не найдены"})
+        stock_cache.clear()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import pytest
 
-from src.widget import get_data, mask_account_card
+from src.widget import get_data, get_data_batch, mask_account_card
 
 
 # Юнит-тесты для mask_account_card
@@ -43,3 +43,22 @@ def test_get_data(input_data, expected_output):
     else:
         result = get_data(input_data)
         assert result == expected_output
+
+
+def test_get_data_batch():
+    dates = [
+        "2024-03-11T02:26:18.671407",
+        "2024-03-11T23:59:59",
+        "",
+        "2024-03",
+        "date-stringT00:00",
+        "2023-10-15T12:00",
+    ]
+    results, errors = get_data_batch(dates)
+
+    assert results == ["11.03.2024", "11.03.2024", None, None, None, "15.10.2023"]
+    assert errors == {2: "Date string is empty", 3: "Incomplete date format", 4: "Invalid date format"}
+    # Пакетный режим дает те же результаты, что и поэлементный get_data
+    assert [get_data(dates[index]) for index, result in enumerate(results) if result] == [
+        result for result in results if result
+    ]